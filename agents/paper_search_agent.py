@@ -2,13 +2,16 @@
 This agent is responsible for going through the paper list and extracting the information.
 """
 
-import yaml
 import json
+import orjson
+import os
 from pathlib import Path
 import sys
-import hashlib
 import re
 import argparse
+import asyncio
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the project root to the Python path BEFORE local imports
 project_root = Path(__file__).resolve().parent.parent
@@ -21,51 +24,158 @@ setup_logging()
 import logging
 from datetime import datetime, timezone
 from tools.api.llm import call_llm
+from tools.api.ratelimit import TokenBucket, bucket_from_config
+from tools.config import load_config as load_shared_config
 
 from tools.paper.search import find_paper_details
-from tools.paper.utils import _normalize_title, _get_config_for_step
+from tools.paper.utils import _normalize_title, _get_config_for_step, _load_prompt
+from tools.paper.cache import cache_journal_path, load_cache
 from tools.paper.analyze import analyze_paper
 from tools.trackers import update_usage
-import PyPDF2
+import pypdfium2 as pdfium
 
 
 
+# Upper bound on raw inputs formatted in a single LLM call.
+MAX_FORMAT_BATCH_SIZE = 20
+
+# Bumped whenever the one-time cache migration in main() gains a new step.
+CACHE_SCHEMA_VERSION = 2
+
+# Heading that opens a paper's reference list.
+# pdfium ends lines with '\r\n', hence the optional '\r'.
+_REF_RE = re.compile(r'(references|bibliography|参考文献)\r?\n', re.IGNORECASE | re.DOTALL)
+
 # --- Main Agent Logic ---
 
 def load_config():
     """Loads the YAML configuration file."""
-    with open(project_root / "config/config.yaml", 'r') as f:
-        return yaml.safe_load(f)
+    return load_shared_config(project_root / "config/config.yaml")
+
+def cache_schema_path(cache_path: Path) -> Path:
+    """
+    Returns the sidecar recording which migrations the cache has been through. It is kept
+    out of cache.json itself because every reader iterates that file's values as papers.
+    """
+    return cache_path.with_suffix('.schema')
+
+def read_cache_schema_version(cache_path: Path) -> int:
+    try:
+        return int(cache_schema_path(cache_path).read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def write_cache_schema_version(cache_path: Path):
+    cache_schema_path(cache_path).write_text(str(CACHE_SCHEMA_VERSION))
 
-def load_cache(cache_path: Path) -> dict:
-    """Loads the cache file if it exists."""
-    if cache_path.exists():
-        with open(cache_path, 'r') as f:
-            return json.load(f)
-    return {}
+def _summary_mtime(summary_path: str | None) -> float:
+    """Modification time of a stored summary, or the epoch if it is missing."""
+    if not summary_path:
+        return 0
+    try:
+        return (project_root / summary_path).stat().st_mtime
+    except (FileNotFoundError, TypeError):
+        return 0
+
+def append_cache_entry(journal, cache: dict, key: str, value: dict):
+    """Updates a cache entry in memory and durably appends it to the open journal file."""
+    cache[key] = value
+    journal.write(orjson.dumps({"k": key, "v": value}) + b"\n")
+    # One small flush per entry, so a crash mid-run keeps every finished paper.
+    journal.flush()
+    os.fsync(journal.fileno())
+
+def _write_snapshot(cache_path: Path, cache: dict):
+    """Writes to a temp file and renames it over the snapshot, so a crash never leaves it half-written."""
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    tmp_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, cache_path)
 
 def save_cache(cache_path: Path, cache: dict):
-    """Saves the cache to a file, sorted by collection date."""
-    # Sort the cache items by 'collected_at' descending.
+    """Saves the cache to a file in insertion order and truncates the journal."""
+    # Readers (the reading page, the service) sort by 'collected_at' themselves.
+    _write_snapshot(cache_path, cache)
+    # Every journaled entry is now part of the snapshot.
+    cache_journal_path(cache_path).unlink(missing_ok=True)
+
+def export_sorted_cache(export_path: Path, cache: dict):
+    """Writes a copy of the cache sorted by collection date, newest first, for tooling."""
     # Use a default old date for items missing the key to handle old data.
     sorted_items = sorted(
         cache.items(),
         key=lambda item: item[1].get('collected_at', '1970-01-01T00:00:00+00:00'),
         reverse=True
     )
-    sorted_cache = dict(sorted_items)
-    with open(cache_path, 'w') as f:
-        json.dump(sorted_cache, f, indent=2)
+    _write_snapshot(export_path, dict(sorted_items))
 
-def read_input_file(file_path: Path) -> str:
-    """Reads the content of the input file."""
-    if not file_path.exists():
+def compact_cache_if_needed(cache_path: Path, cache: dict):
+    """
+    Folds the journal into the snapshot once it grows past twice the snapshot size,
+    or when it ends in a torn line that new appends would otherwise be glued onto.
+    """
+    journal_path = cache_journal_path(cache_path)
+    if not journal_path.exists():
+        return
+    snapshot_size = cache_path.stat().st_size if cache_path.exists() else 0
+    journal_size = journal_path.stat().st_size
+    torn = False
+    if journal_size:
+        with open(journal_path, 'rb') as f:
+            f.seek(-1, 2)
+            torn = f.read(1) != b"\n"
+    if torn or journal_size > 2 * snapshot_size:
+        logging.info(f"Compacting {journal_path.name} into {cache_path.name}.")
+        save_cache(cache_path, cache)
+
+
+class CacheWriter:
+    """
+    Coalesces cache writes for a run. Every put is journaled immediately, but the
+    full snapshot is only rewritten every FLUSH_EVERY entries and once on close.
+    """
+    FLUSH_EVERY = 16
+
+    def __init__(self, cache_path: Path, cache: dict):
+        self.cache_path = cache_path
+        self.cache = cache
+        self.dirty_count = 0
+        self._journal = open(cache_journal_path(cache_path), 'ab')
+
+    def put(self, key: str, value: dict):
+        append_cache_entry(self._journal, self.cache, key, value)
+        self.dirty_count += 1
+        if self.dirty_count >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self, reopen: bool = True):
+        """Folds the journal into the snapshot if anything changed since the last flush."""
+        if self.dirty_count:
+            self._journal.close()
+            save_cache(self.cache_path, self.cache)  # Also removes the journal file
+            self.dirty_count = 0
+            if reopen:
+                self._journal = open(cache_journal_path(self.cache_path), 'ab')
+
+    def close(self):
+        self.flush(reopen=False)
+        self._journal.close()
+
+def read_input_file(file_path: Path, create_dummy: bool = False) -> str:
+    """
+    Reads the content of the input file.
+    A missing file is only replaced by a dummy when `create_dummy` is set (the default input path);
+    a missing user-supplied file is logged and read as empty, so it is skipped.
+    """
+    try:
+        return file_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
         logging.error(f"Input file not found at {file_path}")
+        if not create_dummy:
+            return ""
         dummy_content = "Revisiting the Effectiveness of NeRFs for Dense Mapping https://arxiv.org/abs/2405.09332\nGenerative Pre-training of Diffusion Models"
-        file_path.write_text(dummy_content)
+        file_path.write_text(dummy_content, encoding='utf-8')
         logging.info(f"Created a dummy input file for you at '{file_path.name}'. Please edit it and run again.")
         return dummy_content
-    return file_path.read_text()
 
 # --- Citation Extraction Mode Logic (NEW) ---
 
@@ -74,19 +184,46 @@ def extract_text_from_pdf(pdf_path: Path) -> str:
     if not pdf_path.exists():
         logging.error(f"PDF file not found at: {pdf_path}")
         return ""
-    text = ""
     try:
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
     except Exception as e:
         logging.error(f"Failed to read or parse PDF file: {e}")
-    return text
+        return ""
+
+def extract_references_text_from_pdf(pdf_path: Path) -> str:
+    """
+    Extracts text from the last page backwards up to the page holding the references
+    heading, so the body pages are never decoded. Without a heading it reads the whole PDF.
+    """
+    if not pdf_path.exists():
+        logging.error(f"PDF file not found at: {pdf_path}")
+        return ""
+    try:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            pages = []
+            for i in range(len(pdf) - 1, -1, -1):
+                text = pdf[i].get_textpage().get_text_range()
+                pages.append(text)
+                if _REF_RE.search(text):
+                    break
+            return "\n".join(reversed(pages))
+        finally:
+            pdf.close()
+    except Exception as e:
+        logging.error(f"Failed to read or parse PDF file: {e}")
+        return ""
 
 def find_references_section(full_text: str) -> str:
     """Isolates the 'References' section from the full text of a paper."""
-    match = re.search(r'(?is)(references|bibliography|参考文献)\n', full_text)
+    # The reference list comes last, so in-body mentions of "references" are skipped.
+    match = None
+    for match in _REF_RE.finditer(full_text):
+        pass
     if match:
         return full_text[match.start():]
     logging.warning("Could not find a clear 'References' section. Using the last 20% of the document.")
@@ -95,16 +232,15 @@ def find_references_section(full_text: str) -> str:
 def extract_papers_from_citation(config: dict, pdf_path: Path, snippet: str) -> list:
     """Extracts cited paper titles from a snippet using a source PDF."""
     logging.info(f"Starting citation extraction from PDF: {pdf_path.name}")
-    full_text = extract_text_from_pdf(pdf_path)
-    if not full_text: return []
-    references_text = find_references_section(full_text)
+    tail_text = extract_references_text_from_pdf(pdf_path)
+    if not tail_text: return []
+    references_text = find_references_section(tail_text)
     if not references_text:
         logging.error("Could not extract a references section from the PDF.")
         return []
 
     llm_config = _get_config_for_step(config, 'paper_search_agent', '0_extract_from_citation')
-    prompt_path = project_root / 'prompts' / 'paper_search_agent' / '0_extract_from_citation.md'
-    prompt_template = prompt_path.read_text()
+    prompt_template = _load_prompt('paper_search_agent', '0_extract_from_citation')
     
     user_content = f"## Text Snippet:\n\n{snippet}\n\n---\n\n## Reference List:\n\n{references_text}"
     messages = [{"role": "system", "content": prompt_template}, {"role": "user", "content": user_content}]
@@ -114,7 +250,7 @@ def extract_papers_from_citation(config: dict, pdf_path: Path, snippet: str) ->
     
     if message and 'content' in message:
         try:
-            data = json.loads(message['content'])
+            data = orjson.loads(message['content'])
             papers = data.get('papers', [])
             if papers:
                 logging.info(f"Successfully extracted {len(papers)} cited papers.")
@@ -130,6 +266,27 @@ def extract_papers_from_citation(config: dict, pdf_path: Path, snippet: str) ->
 
 # --- Main Execution Logic ---
 
+def _call_paced(bucket: Optional[TokenBucket], func, *args):
+    """Calls `func` once a token is available; blocks the worker thread, not the event loop."""
+    if bucket:
+        bucket.acquire()
+    return func(*args)
+
+async def _recall_one(paper: dict, config: dict, usage_tracker: dict, sem: asyncio.Semaphore,
+                      bucket: Optional[TokenBucket]) -> dict:
+    """Runs the blocking detail lookup for one paper in a worker thread."""
+    async with sem:
+        return await asyncio.to_thread(_call_paced, bucket, find_paper_details, paper, config, usage_tracker)
+
+async def _recall_all(papers: list, config: dict, usage_tracker: dict, concurrency: int) -> list:
+    """Looks up details for all papers concurrently, at most `concurrency` at a time."""
+    sem = asyncio.Semaphore(concurrency)
+    bucket = bucket_from_config(config, 'recall_requests_per_second')
+    return await asyncio.gather(
+        *[_recall_one(paper, config, usage_tracker, sem, bucket) for paper in papers],
+        return_exceptions=True
+    )
+
 def format_input(config: dict, raw_text: str, usage_tracker: dict) -> list:
     """
     Uses an LLM to format the raw text input into a structured list of papers.
@@ -139,12 +296,10 @@ def format_input(config: dict, raw_text: str, usage_tracker: dict) -> list:
     
     # 1. Get LLM configuration for this step
     step_config_name = '1_input_formatting'
-    llm_name = config['agents']['paper_search_agent'][step_config_name]
-    llm_config = config['llms'][llm_name]
+    llm_config = _get_config_for_step(config, 'paper_search_agent', step_config_name)
     
     # 2. Load the prompt
-    prompt_path = project_root / 'prompts' / 'paper_search_agent' / f'{step_config_name}.md'
-    prompt_template = prompt_path.read_text()
+    prompt_template = _load_prompt('paper_search_agent', step_config_name)
     
     # 3. Construct messages
     messages = [
@@ -154,7 +309,7 @@ def format_input(config: dict, raw_text: str, usage_tracker: dict) -> list:
     
     # 4. Call the LLM
     logging.info(f"Calling model '{llm_config['model']}' for formatting...")
-    message, usage = call_llm(llm_config, messages, is_json=True)
+    message, usage = call_llm(llm_config, messages, is_json=True, stream=True)
     
     # 5. Update usage tracker
     update_usage(usage_tracker, llm_config, usage)
@@ -162,7 +317,7 @@ def format_input(config: dict, raw_text: str, usage_tracker: dict) -> list:
     if message and 'content' in message:
         try:
             content = message['content']
-            formatted_data = json.loads(content)
+            formatted_data = orjson.loads(content)
             logging.info("Input formatted successfully.")
             return formatted_data.get('papers', [])
         except (json.JSONDecodeError, KeyError) as e:
@@ -173,6 +328,63 @@ def format_input(config: dict, raw_text: str, usage_tracker: dict) -> list:
         logging.error("Failed to get a valid response from the LLM.")
         return []
 
+def analyze_and_store_paper(paper: dict, config: dict, usage_tracker: dict, agent_storage_path: Path) -> str | None:
+    """
+    Analyzes a paper and writes its summary to a date-based, human-readable directory.
+    Returns the summary path relative to the project root, or None on failure.
+    """
+    analysis_results = analyze_paper(paper, config, usage_tracker)
+    if not analysis_results:
+        return None
+    today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    paper_id = paper.get('arxiv_id', 'unknown_id')
+    paper_dir = agent_storage_path / today_str / paper_id
+    paper_dir.mkdir(parents=True, exist_ok=True)
+    
+    summary_path = paper_dir / 'summary.md'
+    
+    summary_path.write_text(analysis_results['summary'], encoding='utf-8')
+    
+    # Use relative path for storage
+    return str(summary_path.relative_to(project_root))
+
+def format_input_batch(config: dict, raw_texts: list, usage_tracker: dict) -> list:
+    """
+    Formats several raw text inputs with one LLM call per batch instead of one per input.
+    Returns one paper list per input, in the same order.
+    """
+    step_config_name = '1_input_formatting'
+    llm_config = _get_config_for_step(config, 'paper_search_agent', step_config_name)
+    prompt_template = _load_prompt('paper_search_agent', f'{step_config_name}_batch')
+
+    results = []
+    # Keep batches small: long multi-input prompts degrade output quality.
+    for start in range(0, len(raw_texts), MAX_FORMAT_BATCH_SIZE):
+        batch = raw_texts[start:start + MAX_FORMAT_BATCH_SIZE]
+        messages = [
+            {"role": "system", "content": prompt_template},
+            {"role": "user", "content": orjson.dumps({"inputs": batch}).decode()}
+        ]
+        logging.info(f"Calling model '{llm_config['model']}' to format {len(batch)} input(s)...")
+        message, usage = call_llm(llm_config, messages, is_json=True)
+        update_usage(usage_tracker, llm_config, usage)
+
+        batch_results = [[] for _ in batch]
+        if message and 'content' in message:
+            try:
+                formatted = orjson.loads(message['content']).get('results', [])
+                if len(formatted) == len(batch):
+                    batch_results = [item.get('papers', []) for item in formatted]
+                else:
+                    logging.error(f"Expected {len(batch)} formatted inputs but got {len(formatted)}.")
+            except (json.JSONDecodeError, KeyError, AttributeError) as e:
+                logging.error(f"Error parsing batched LLM response: {e}")
+                logging.error(f"Raw response content: {message['content']}")
+        else:
+            logging.error("Failed to get a valid response from the LLM.")
+        results.extend(batch_results)
+    return results
+
 def main():
     """Main execution flow of the paper search agent."""
     parser = argparse.ArgumentParser(description="Nana Paper Search Agent")
@@ -185,6 +397,12 @@ def main():
     )
     parser.add_argument('--pdf', type=str, help="Path to the source PDF file (for 'from_citation' mode).")
     parser.add_argument('--snippet', type=str, help="Text snippet with citations (for 'from_citation' mode).")
+    parser.add_argument(
+        '--input',
+        type=str,
+        nargs='+',
+        help="Input file(s) with paper lists (for 'from_file' mode). Defaults to the agent's .in file."
+    )
     args = parser.parse_args()
 
     config = load_config()
@@ -201,31 +419,43 @@ def main():
     cache = load_cache(cache_path)
 
     # --- One-time cache migration ---
-    migrated = False
-    for key, value in cache.items():
-        if 'summary_path' in value and value['summary_path'] and Path(value['summary_path']).is_absolute():
-            value['summary_path'] = str(Path(value['summary_path']).relative_to(project_root))
-            migrated = True
-        if 'collected_at' not in value:
-            summary_mtime = datetime.fromtimestamp(0, timezone.utc)
-            if 'summary_path' in value and value['summary_path']:
-                try:
-                    summary_mtime = datetime.fromtimestamp((project_root / value['summary_path']).stat().st_mtime, timezone.utc)
-                except (FileNotFoundError, TypeError):
-                    pass
-            value['collected_at'] = summary_mtime.isoformat()
-            migrated = True
-    if migrated:
-        logging.info("Performed one-time migration on cache.json.")
+    # The schema stamp lets an already-migrated cache (the normal case) skip the scan entirely.
+    if read_cache_schema_version(cache_path) != CACHE_SCHEMA_VERSION:
+        needs_migration = any(
+            'collected_at' not in value
+            or (value.get('summary_path') and Path(value['summary_path']).is_absolute())
+            for value in cache.values()
+        )
+        if needs_migration:
+            for key, value in cache.items():
+                if 'summary_path' in value and value['summary_path'] and Path(value['summary_path']).is_absolute():
+                    value['summary_path'] = str(Path(value['summary_path']).relative_to(project_root))
+            # Backfill collected_at from summary mtimes; stat() releases the GIL, so overlap the calls.
+            missing = [value for value in cache.values() if 'collected_at' not in value]
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                mtimes = list(executor.map(_summary_mtime, (value.get('summary_path') for value in missing)))
+            for value, mtime in zip(missing, mtimes):
+                value['collected_at'] = datetime.fromtimestamp(mtime, timezone.utc).isoformat()
+            save_cache(cache_path, cache)
+            logging.info("Performed one-time migration on cache.json.")
+        write_cache_schema_version(cache_path)
     # --- End migration ---
+    compact_cache_if_needed(cache_path, cache)
     
     paper_list = []
     if args.mode == 'from_file':
         logging.info("Running in 'from_file' mode.")
-        input_file_path = project_root / 'agents' / f'{agent_name}.in'
-        raw_input_text = read_input_file(input_file_path)
-        if raw_input_text.strip():
-            paper_list = format_input(config, raw_input_text, usage_tracker)
+        if args.input:
+            raw_input_texts = [read_input_file(Path(p)) for p in args.input]
+        else:
+            raw_input_texts = [read_input_file(project_root / 'agents' / f'{agent_name}.in', create_dummy=True)]
+        raw_input_texts = [text for text in raw_input_texts if text.strip()]
+        if len(raw_input_texts) == 1:
+            paper_list = format_input(config, raw_input_texts[0], usage_tracker)
+        elif raw_input_texts:
+            # Several files share batched LLM calls instead of one round trip each.
+            for papers in format_input_batch(config, raw_input_texts, usage_tracker):
+                paper_list.extend(papers)
     elif args.mode == 'from_citation':
         logging.info("Running in 'from_citation' mode.")
         if not args.pdf or not args.snippet:
@@ -242,109 +472,150 @@ def main():
     logging.info(json.dumps(paper_list, indent=2))
     logging.info("--------------------------\n")
 
-    # Step 2: Find Paper Details (Recall)
-    logging.info("---")
-    logging.info("Step 2: Finding paper details (PDF links)...")
-    recalled_papers = []
-    failed_recall = []
-
-    for paper in paper_list:
-        logging.info(f"\nProcessing: {paper['title']}")
-        cache_key = _normalize_title(paper['title'])
-        provided_url = paper.get('url', '').strip() if paper.get('url') else None
+    # New and updated cache entries are journaled as they land; the snapshot is rewritten in batches.
+    cache_writer = CacheWriter(cache_path, cache)
+    try:
+        # Step 2: Find Paper Details (Recall)
+        logging.info("---")
+        logging.info("Step 2: Finding paper details (PDF links)...")
+        recalled_papers = []
+        failed_recall = []
+        recall_ok = {}
+        papers_to_recall = []
+
+        for i, paper in enumerate(paper_list):
+            logging.info(f"\nProcessing: {paper['title']}")
+            cache_key = _normalize_title(paper['title'])
+            provided_url = paper.get('url', '').strip() if paper.get('url') else None
         
-        # Check if we should use cache or update with new URL
-        use_cache = (
-            cache_key in cache and 
-            'pdf_url' in cache[cache_key] and 
-            cache[cache_key]['pdf_url'] and  # Cache has valid PDF URL
-            not provided_url  # No new URL provided
-        )
+            # Check if we should use cache or update with new URL
+            use_cache = (
+                cache_key in cache and 
+                'pdf_url' in cache[cache_key] and 
+                cache[cache_key]['pdf_url'] and  # Cache has valid PDF URL
+                not provided_url  # No new URL provided
+            )
         
-        if use_cache:
-            logging.info("Found paper details in cache.")
-            paper.update(cache[cache_key])
-            recalled_papers.append(paper)
-            cached_details_count += 1
-            continue
+            if use_cache:
+                logging.info("Found paper details in cache.")
+                paper.update(cache[cache_key])
+                recall_ok[i] = True
+                cached_details_count += 1
+                continue
         
-        # If URL is provided or cache is missing/incomplete, get/update details
-        if provided_url and cache_key in cache:
-            logging.info("Updating cached paper with provided URL.")
-        elif provided_url:
-            logging.info("Using provided URL for new paper.")
-        else:
-            logging.info("No URL provided, searching for paper details.")
-
-        details = find_paper_details(paper, config, usage_tracker)
-        if details:
-            paper.update(details)
-            # Add/update collected_at timestamp
-            details['collected_at'] = datetime.now(timezone.utc).isoformat()
-            cache[cache_key] = details
-            recalled_papers.append(paper)
-        else:
-            failed_recall.append(paper)
-
-    logging.info("\n--- Recall Results ---")
-    logging.info(f"Successfully found details for: {len(recalled_papers)} paper(s)")
-    if failed_recall:
-        logging.warning(f"Failed to find details for: {len(failed_recall)} paper(s)")
-    logging.info("----------------------\n")
-
-    # Step 3: Analyze Papers
-    logging.info("---")
-    logging.info("Step 3: Analyzing papers...")
-    analyzed_papers = []
-    failed_analysis = []
-
-    for paper in recalled_papers:
-        cache_key = _normalize_title(paper['title'])
-        if cache_key in cache and 'summary_path' in cache[cache_key]:
-            logging.info(f"Found analysis in cache for '{paper['title']}'. Skipping.")
-            paper.update(cache[cache_key])
-            analyzed_papers.append(paper)
-            cached_analysis_count += 1
-            continue
-        
-        analysis_results = analyze_paper(paper, config, usage_tracker)
-        if analysis_results:
-            # Save results to a date-based, human-readable directory
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            paper_id = paper.get('arxiv_id', 'unknown_id')
-            paper_dir = agent_storage_path / today_str / paper_id
-            paper_dir.mkdir(parents=True, exist_ok=True)
-            
-            summary_path = paper_dir / 'summary.md'
-            
-            with open(summary_path, 'w') as f:
-                f.write(analysis_results['summary'])
-            
-            # Use relative path for storage
-            relative_summary_path = summary_path.relative_to(project_root)
-            
-            paper['summary_path'] = str(relative_summary_path)
-
-            # The cache key may have changed if the title was canonicalized during recall.
-            # We must ensure the entry exists for the potentially new key before updating.
-            if cache_key not in cache:
-                # This is a new entry, probably due to a title change.
-                # We'll create it and copy over the existing paper details.
-                cache[cache_key] = paper.copy()
-
-            # Now, update the entry with the summary path.
-            cache[cache_key]['summary_path'] = str(relative_summary_path)
-            cache[cache_key]['collected_at'] = datetime.now(timezone.utc).isoformat()
-            
-            # Save cache immediately after each analysis
-            save_cache(cache_path, cache)
+            # If URL is provided or cache is missing/incomplete, get/update details
+            if provided_url and cache_key in cache:
+                logging.info("Updating cached paper with provided URL.")
+            elif provided_url:
+                logging.info("Using provided URL for new paper.")
+            else:
+                logging.info("No URL provided, searching for paper details.")
+            papers_to_recall.append((i, cache_key))
+
+        # Lookups are network-bound, so run them concurrently and apply the results in order.
+        recall_concurrency = config.get('recall_concurrency', 5)
+        if papers_to_recall:
+            logging.info(f"Looking up {len(papers_to_recall)} paper(s) with concurrency {recall_concurrency}...")
+        results = asyncio.run(_recall_all(
+            [paper_list[i] for i, _ in papers_to_recall], config, usage_tracker, recall_concurrency
+        ))
+        for (i, cache_key), details in zip(papers_to_recall, results):
+            paper = paper_list[i]
+            if isinstance(details, Exception):
+                logging.error(f"Error finding details for '{paper['title']}': {details}")
+                details = None
+            if details:
+                paper.update(details)
+                # Add/update collected_at timestamp
+                details['collected_at'] = datetime.now(timezone.utc).isoformat()
+                cache_writer.put(cache_key, details)
+            recall_ok[i] = bool(details)
+
+        for i, paper in enumerate(paper_list):
+            if recall_ok[i]:
+                recalled_papers.append(paper)
+            else:
+                failed_recall.append(paper)
+
+        logging.info("\n--- Recall Results ---")
+        logging.info(f"Successfully found details for: {len(recalled_papers)} paper(s)")
+        if failed_recall:
+            logging.warning(f"Failed to find details for: {len(failed_recall)} paper(s)")
+        logging.info("----------------------\n")
+
+        # Step 3: Analyze Papers
+        logging.info("---")
+        logging.info("Step 3: Analyzing papers...")
+        analyzed_papers = []
+        failed_analysis = []
+
+        analysis_ok = {}
+        papers_to_analyze = []
+
+        # Keys that already have a summary, computed once rather than probed per paper.
+        analysed_keys = frozenset(k for k, v in cache.items() if v.get('summary_path'))
+        for i, paper in enumerate(recalled_papers):
+            cache_key = _normalize_title(paper['title'])
+            if cache_key in analysed_keys:
+                logging.info(f"Found analysis in cache for '{paper['title']}'. Skipping.")
+                paper.update(cache[cache_key])
+                analysis_ok[i] = True
+                cached_analysis_count += 1
+                continue
+            papers_to_analyze.append((i, cache_key))
+
+        # Throughput is bounded by the analysis rate limit, so the concurrency cap only needs
+        # to be high enough to keep that budget busy while individual analyses are in flight.
+        analysis_concurrency = config.get('max_analysis_concurrent', 8)
+        if papers_to_analyze:
+            logging.info(f"Analyzing {len(papers_to_analyze)} paper(s) with concurrency {analysis_concurrency}...")
+
+        async def _analyze_all() -> list:
+            sem = asyncio.Semaphore(analysis_concurrency)
+            bucket = bucket_from_config(config, 'analysis_requests_per_minute', per=60.0)
+
+            async def _analyze_one(paper: dict, cache_key: str) -> bool:
+                async with sem:
+                    relative_summary_path = await asyncio.to_thread(
+                        _call_paced, bucket, analyze_and_store_paper, paper, config, usage_tracker, agent_storage_path
+                    )
+                if not relative_summary_path:
+                    return False
+                paper['summary_path'] = relative_summary_path
+
+                # The cache key may have changed if the title was canonicalized during recall.
+                # If there is no entry for the potentially new key, start from the paper details.
+                # This runs on the event loop thread between awaits, so cache updates never interleave.
+                entry = dict(cache.get(cache_key) or paper)
+
+                # Now, update the entry with the summary path.
+                entry['summary_path'] = relative_summary_path
+                entry['collected_at'] = datetime.now(timezone.utc).isoformat()
             
-            analyzed_papers.append(paper)
-        else:
-            failed_analysis.append(paper)
-
-    # Finalization
-    save_cache(cache_path, cache)
+                # Journal the entry immediately after each analysis
+                cache_writer.put(cache_key, entry)
+                return True
+
+            return await asyncio.gather(
+                *[_analyze_one(recalled_papers[i], cache_key) for i, cache_key in papers_to_analyze],
+                return_exceptions=True
+            )
+
+        results = asyncio.run(_analyze_all())
+        for (i, _), ok in zip(papers_to_analyze, results):
+            if isinstance(ok, Exception):
+                logging.error(f"Error analyzing '{recalled_papers[i]['title']}': {ok}")
+                ok = False
+            analysis_ok[i] = ok
+
+        for i, paper in enumerate(recalled_papers):
+            if analysis_ok[i]:
+                analyzed_papers.append(paper)
+            else:
+                failed_analysis.append(paper)
+    finally:
+        # Finalization
+        cache_writer.close()
 
     # Step 4: Final Report
     logging.info("\n\n---")
@@ -2,7 +2,7 @@
 聊天相关API路由
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Dict
 import sys
 from pathlib import Path
@@ -12,15 +12,12 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(project_root))
 
 from api.models import ChatRequest, ChatResponse, ChatStartRequest, ErrorResponse
-from services.chat_service import ChatService
+from services.chat_service import ChatService, get_chat_service
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-# 创建服务实例
-chat_service = ChatService()
-
 @router.post("/start")
-async def start_chat(request: ChatStartRequest):
+async def start_chat(request: ChatStartRequest, chat_service: ChatService = Depends(get_chat_service)):
     """
     开始新的聊天对话
     """
@@ -33,7 +30,7 @@ async def start_chat(request: ChatStartRequest):
         raise HTTPException(status_code=500, detail=f"Failed to start chat: {str(e)}")
 
 @router.post("/message", response_model=ChatResponse)
-async def send_message(request: ChatRequest):
+async def send_message(request: ChatRequest, chat_service: ChatService = Depends(get_chat_service)):
     """
     发送聊天消息
     """
@@ -50,7 +47,7 @@ async def send_message(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Failed to send message: {str(e)}")
 
 @router.get("/suggestions/{paper_id}")
-async def get_suggested_questions(paper_id: str):
+async def get_suggested_questions(paper_id: str, chat_service: ChatService = Depends(get_chat_service)):
     """
     获取建议的问题列表
     """
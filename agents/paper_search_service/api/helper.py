@@ -2,60 +2,54 @@
 Helper页面API端点
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pathlib import Path
+from typing import Optional, Tuple
 import markdown
 import logging
 
 router = APIRouter()
 
-@router.get("/helper/content")
-async def get_helper_content():
-    """获取helper页面的HTML内容"""
+HELPER_FILE = Path(__file__).parent.parent / "helper_text.md"
+
+def render_helper() -> Tuple[Optional[str], Optional[str]]:
+    """
+    读取并渲染helper页面，返回(markdown, html)；文件不存在时返回(None, None)
+    在应用启动时调用一次，修改helper_text.md后需重启服务
+    """
     try:
-        # 读取markdown文件
-        helper_file = Path(__file__).parent.parent / "helper_text.md"
-        
-        if not helper_file.exists():
-            raise HTTPException(status_code=404, detail="Helper file not found")
-        
-        # 读取markdown内容
-        with open(helper_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-        
-        # 转换为HTML
-        html_content = markdown.markdown(
-            markdown_content,
-            extensions=['codehilite', 'fenced_code', 'tables', 'nl2br']
-        )
-        
-        return {
-            "success": True,
-            "html_content": html_content,
-            "raw_markdown": markdown_content
-        }
-        
-    except Exception as e:
-        logging.error(f"Error reading helper content: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to load helper content: {str(e)}")
+        markdown_content = HELPER_FILE.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        logging.warning(f"Helper file not found: {HELPER_FILE}")
+        return None, None
+
+    html_content = markdown.markdown(
+        markdown_content,
+        extensions=['codehilite', 'fenced_code', 'tables', 'nl2br']
+    )
+    return markdown_content, html_content
+
+@router.get("/helper/content")
+async def get_helper_content(request: Request):
+    """获取helper页面的HTML内容（启动时预渲染）"""
+    state = request.app.state
+    if state.helper_md is None:
+        raise HTTPException(status_code=404, detail="Helper file not found")
+    
+    return {
+        "success": True,
+        "html_content": state.helper_html,
+        "raw_markdown": state.helper_md
+    }
 
 @router.get("/helper/raw")
-async def get_helper_raw():
+async def get_helper_raw(request: Request):
     """获取helper页面的原始markdown内容"""
-    try:
-        helper_file = Path(__file__).parent.parent / "helper_text.md"
-        
-        if not helper_file.exists():
-            raise HTTPException(status_code=404, detail="Helper file not found")
-        
-        with open(helper_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return {
-            "success": True,
-            "content": content
-        }
-        
-    except Exception as e:
-        logging.error(f"Error reading raw helper content: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to load raw helper content: {str(e)}")
+    state = request.app.state
+    if state.helper_md is None:
+        raise HTTPException(status_code=404, detail="Helper file not found")
+    
+    return {
+        "success": True,
+        "content": state.helper_md
+    }
@@ -2,7 +2,7 @@
 论文相关API路由
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 import sys
 from pathlib import Path
@@ -12,15 +12,12 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(project_root))
 
 from api.models import PapersListResponse, PaperDetail, ErrorResponse
-from services.paper_service import PaperService
+from services.paper_service import PaperService, get_paper_service
 
 router = APIRouter(prefix="/papers", tags=["papers"])
 
-# 创建服务实例
-paper_service = PaperService()
-
 @router.get("/", response_model=PapersListResponse)
-async def get_papers(keyword: Optional[str] = Query(None, description="搜索关键词")):
+async def get_papers(keyword: Optional[str] = Query(None, description="搜索关键词"), paper_service: PaperService = Depends(get_paper_service)):
     """
     获取论文列表，支持关键词搜索
     """
@@ -33,7 +30,7 @@ async def get_papers(keyword: Optional[str] = Query(None, description="搜索关
         raise HTTPException(status_code=500, detail=f"Failed to load papers: {str(e)}")
 
 @router.get("/by-title", response_model=PaperDetail)
-async def get_paper_by_title(display_title: str = Query(..., description="论文显示标题")):
+async def get_paper_by_title(display_title: str = Query(..., description="论文显示标题"), paper_service: PaperService = Depends(get_paper_service)):
     """
     根据显示标题获取论文详情
     """
@@ -46,7 +43,7 @@ async def get_paper_by_title(display_title: str = Query(..., description="论文
         raise HTTPException(status_code=500, detail=f"Failed to get paper: {str(e)}")
 
 @router.get("/refresh", response_model=PapersListResponse)
-async def refresh_papers():
+async def refresh_papers(paper_service: PaperService = Depends(get_paper_service)):
     """
     刷新论文列表（重新加载缓存）
     """
@@ -57,7 +54,7 @@ async def refresh_papers():
         raise HTTPException(status_code=500, detail=f"Failed to refresh papers: {str(e)}")
 
 @router.get("/{arxiv_id}", response_model=PaperDetail)
-async def get_paper_by_id(arxiv_id: str):
+async def get_paper_by_id(arxiv_id: str, paper_service: PaperService = Depends(get_paper_service)):
     """
     根据arXiv ID获取论文详情
     """
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import sys
+import uuid
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent.parent.parent
@@ -13,9 +14,11 @@ from models.task import ProcessingTask
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-# Initialize task processor (simplified, no concurrency parameters)
-storage_dir = Path(__file__).resolve().parent.parent / "storage" / "tasks"
-task_processor = TaskProcessor(storage_dir)
+TASKS_STORAGE_DIR = Path(__file__).resolve().parent.parent / "storage" / "tasks"
+
+def get_task_processor(request: Request) -> TaskProcessor:
+    """The app-wide TaskProcessor, created once in main.py's lifespan"""
+    return request.app.state.task_processor
 
 class CreateTaskRequest(BaseModel):
     title: str
@@ -51,10 +54,9 @@ class TaskLogsResponse(BaseModel):
     logs: List[Dict[str, Any]]
 
 @router.post("/", response_model=TaskResponse)
-async def create_task(request: CreateTaskRequest):
+async def create_task(request: CreateTaskRequest, task_processor: TaskProcessor = Depends(get_task_processor)):
     """Create a new task and add it to the processing queue"""
     try:
-        import uuid
         task = ProcessingTask(
             id=str(uuid.uuid4()),
             title=request.title,
@@ -63,7 +65,8 @@ async def create_task(request: CreateTaskRequest):
         )
         task_processor.task_storage.add_task(task)
         
-        # Task will be automatically picked up by the scheduler
+        # Task will be picked up by the scheduler as soon as a slot is free
+        task_processor.notify_new_task()
         return TaskResponse(
             id=task.id,
             title=task.title,
@@ -78,17 +81,18 @@ async def create_task(request: CreateTaskRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create task: {str(e)}")
 
 @router.get("/", response_model=TaskListResponse)
-async def get_tasks():
+async def get_tasks(task_processor: TaskProcessor = Depends(get_task_processor)):
     """Get all tasks"""
     try:
         tasks_data = task_processor.get_all_tasks()
-        tasks = [TaskResponse(**task_data) for task_data in tasks_data]
-        return TaskListResponse(tasks=tasks)
+        # 数据由TaskProcessor内部生成，跳过逐字段校验
+        tasks = [TaskResponse.model_construct(**task_data) for task_data in tasks_data]
+        return TaskListResponse.model_construct(tasks=tasks)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get tasks: {str(e)}")
 
 @router.get("/{task_id}", response_model=TaskDetailResponse)
-async def get_task(task_id: str):
+async def get_task(task_id: str, task_processor: TaskProcessor = Depends(get_task_processor)):
     """Get detailed information about a specific task"""
     try:
         task_data = task_processor.get_task_status(task_id)
@@ -101,7 +105,7 @@ async def get_task(task_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get task: {str(e)}")
 
 @router.get("/{task_id}/logs", response_model=TaskLogsResponse)
-async def get_task_logs(task_id: str):
+async def get_task_logs(task_id: str, task_processor: TaskProcessor = Depends(get_task_processor)):
     """Get detailed logs for a task"""
     try:
         task = task_processor.task_storage.get_task(task_id)
@@ -126,7 +130,7 @@ async def get_task_logs(task_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get task logs: {str(e)}")
 
 @router.delete("/{task_id}")
-async def delete_task(task_id: str):
+async def delete_task(task_id: str, task_processor: TaskProcessor = Depends(get_task_processor)):
     """Delete a task"""
     try:
         task = task_processor.task_storage.get_task(task_id)
@@ -145,7 +149,7 @@ async def delete_task(task_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to delete task: {str(e)}")
 
 @router.get("/system/stats")
-async def get_system_stats():
+async def get_system_stats(task_processor: TaskProcessor = Depends(get_task_processor)):
     """Get system processing statistics"""
     try:
         stats = task_processor.get_processing_stats()
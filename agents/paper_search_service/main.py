@@ -5,8 +5,9 @@ FastAPI版本的Paper Search Agent主应用
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import uvicorn
+from contextlib import asynccontextmanager
 from pathlib import Path
 import sys
 
@@ -16,10 +17,25 @@ sys.path.append(str(project_root))
 
 from api.papers import router as papers_router
 from api.chat import router as chat_router
-from api.tasks import router as tasks_router
-from api.helper import router as helper_router
+from api.tasks import router as tasks_router, TASKS_STORAGE_DIR
+from api.helper import router as helper_router, render_helper
+from services.task_service import TaskProcessor
 
-app = FastAPI(title="Paper Search Agent Rev1", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：任务处理器（含后台调度线程）只创建一次，关闭时停止调度"""
+    # helper页面在启动时渲染一次，请求中不再解析markdown
+    app.state.helper_md, app.state.helper_html = render_helper()
+    app.state.task_processor = TaskProcessor(TASKS_STORAGE_DIR)
+    yield
+    app.state.task_processor.stop_scheduler()
+
+app = FastAPI(
+    title="Paper Search Agent Rev1",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson序列化JSON响应，比标准库json快
+    lifespan=lifespan,
+)
 
 # 设置静态文件目录
 app.mount("/static", StaticFiles(directory="static"), name="static")
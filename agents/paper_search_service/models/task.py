@@ -1,15 +1,22 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
-import json
-import fcntl  # For file locking on Unix systems
-import time
+from typing import List, Optional, Dict, Any, Set
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from tools.paper.utils import _normalize_title
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 
 class LogEntry(BaseModel):
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=_utcnow)
     stage: str
     level: str  # INFO, WARNING, ERROR
     message: str
@@ -25,6 +32,9 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
+
+
 class PaperStatus(str, Enum):
     PENDING = "pending"
     FORMATTING = "formatting"
@@ -41,8 +51,16 @@ class PaperTask(BaseModel):
     status: PaperStatus = PaperStatus.PENDING
     progress: Dict[str, Any] = Field(default_factory=dict)
     error: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
+    _cache_key: Optional[str] = PrivateAttr(default=None)
+    
+    @property
+    def cache_key(self) -> str:
+        """Reading-cache key (normalized title), computed on first use"""
+        if self._cache_key is None:
+            self._cache_key = _normalize_title(self.title)
+        return self._cache_key
 
 
 class ProcessingTask(BaseModel):
@@ -52,29 +70,104 @@ class ProcessingTask(BaseModel):
     status: TaskStatus = TaskStatus.PENDING
     papers: List[PaperTask] = Field(default_factory=list)
     input_text: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
     progress: Dict[str, Any] = Field(default_factory=dict)
     logs: List[LogEntry] = Field(default_factory=list)
+    # Stages with at least one ERROR log, so checks don't rescan the whole log
+    _error_stages: Set[str] = PrivateAttr(default_factory=set)
+    # Paper indices partitioned by status; kept in sync by set_papers/set_paper_status
+    _papers_by_status: Dict[PaperStatus, Set[int]] = PrivateAttr(default_factory=dict)
+    # Bumped by every mutating method below, so storage can skip saving an unchanged task.
+    # Change papers through these methods (not by assigning their fields) so the change is saved.
+    _version: int = PrivateAttr(default=0)
+    
+    def model_post_init(self, __context: Any):
+        self._index_logs()
+        self._index_papers()
+    
+    def _index_logs(self):
+        self._error_stages = {log.stage for log in self.logs if log.level == "ERROR"}
+    
+    def _index_papers(self):
+        by_status = {status: set() for status in PaperStatus}
+        for i, paper in enumerate(self.papers):
+            by_status[paper.status].add(i)
+        self._papers_by_status = by_status
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def set_papers(self, papers: List[PaperTask]):
+        self.papers = papers
+        self._index_papers()
+        self._version += 1
+    
+    def set_paper_status(self, index: int, status: PaperStatus, ts: Optional[datetime] = None) -> datetime:
+        """Change a paper's status and stamp its `updated_at`; returns the timestamp used.
+
+        Use this instead of assigning `paper.status` so the index stays valid.
+        """
+        now = ts or _utcnow()
+        paper = self.papers[index]
+        self._papers_by_status[paper.status].discard(index)
+        self._papers_by_status[status].add(index)
+        paper.status = status
+        paper.updated_at = now
+        self._version += 1
+        return now
+    
+    def set_paper_error(self, index: int, error: Optional[str]):
+        self.papers[index].error = error
+        self._version += 1  # After the write, so a save that sees the new version also sees the error
+    
+    def set_paper_url(self, index: int, url: Optional[str]):
+        self.papers[index].url = url
+        self._version += 1
+    
+    def set_paper_progress(self, index: int, key: str, value: Any):
+        """Set one entry of a paper's `progress` dict"""
+        self.papers[index].progress[key] = value
+        self._version += 1
+    
+    def paper_indices(self, status: PaperStatus) -> List[int]:
+        """Indices of the papers currently in `status`, in list order"""
+        return sorted(self._papers_by_status[status])
+    
+    def count_papers(self, status: PaperStatus) -> int:
+        return len(self._papers_by_status[status])
     
     def update_status(self, status: TaskStatus):
+        now = _utcnow()
         self.status = status
-        self.updated_at = datetime.now(timezone.utc)
-        if status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
-            self.completed_at = datetime.now(timezone.utc)
+        self.updated_at = now
+        if status in _TERMINAL_STATUSES:
+            self.completed_at = now
+        self._version += 1
     
-    def add_log(self, stage: str, level: str, message: str, data: Optional[Dict[str, Any]] = None):
-        """Add a log entry to the task"""
+    def add_log(self, stage: str, level: str, message: str, data: Optional[Dict[str, Any]] = None,
+                ts: Optional[datetime] = None):
+        """Add a log entry to the task; `ts` lets callers reuse a timestamp they already took"""
+        now = ts or _utcnow()
         log_entry = LogEntry(
+            timestamp=now,
             stage=stage,
             level=level,
             message=message,
             data=data
         )
         self.logs.append(log_entry)
-        self.updated_at = datetime.now(timezone.utc)
+        if level == "ERROR":
+            self._error_stages.add(stage)
+        self.updated_at = now
+        self._version += 1
+    
+    def has_error_log(self, stage: str) -> bool:
+        """Whether an ERROR log has been recorded for `stage`"""
+        return stage in self._error_stages
     
     def get_progress_summary(self) -> Dict[str, Any]:
         total_papers = len(self.papers)
@@ -87,11 +180,8 @@ class ProcessingTask(BaseModel):
                 "percentage": 0
             }
         
-        status_counts = {}
-        for paper in self.papers:
-            status_counts[paper.status] = status_counts.get(paper.status, 0) + 1
-        completed = status_counts.get(PaperStatus.COMPLETED, 0)
-        failed = status_counts.get(PaperStatus.FAILED, 0)
+        completed = self.count_papers(PaperStatus.COMPLETED)
+        failed = self.count_papers(PaperStatus.FAILED)
         pending = total_papers - completed - failed
         
         return {
@@ -99,112 +189,151 @@ class ProcessingTask(BaseModel):
             "completed": completed,
             "failed": failed,
             "pending": pending,
-            "percentage": round((completed + failed) / total_papers * 100)
+            # Integer floor: never reports 100% while a paper is still pending
+            "percentage": (completed + failed) * 100 // total_papers
         }
 
 
+# Reads the legacy single-file tasks.json in one pydantic-core pass
+_TASKS_ADAPTER = TypeAdapter(Dict[str, ProcessingTask])
+# Validates a whole log journal in one pass
+_LOGS_ADAPTER = TypeAdapter(List[LogEntry])
+
+
 class TaskStorage:
+    """In-memory task map persisted as one JSON file per task under `storage_dir/tasks/`.
+
+    Logs only ever grow, so they live in an append-only `<id>.logs.jsonl` next to the
+    task file instead of being re-serialized with the task on every save.
+    """
     def __init__(self, storage_dir: Path):
         self.storage_dir = storage_dir
-        self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.tasks_file = storage_dir / "tasks.json"
+        self.tasks_dir = storage_dir / "tasks"
+        self.tasks_dir.mkdir(parents=True, exist_ok=True)
+        self.tasks_file = storage_dir / "tasks.json"  # Legacy single-file store, migrated on load
+        self._write_lock = threading.Lock()
+        self._persisted_log_counts: Dict[str, int] = {}  # task id -> logs already in its .jsonl
+        self._pending_ids: Dict[str, None] = {}  # Ids of PENDING tasks, oldest first (dict as ordered set)
+        self._saved_versions: Dict[str, int] = {}  # task id -> ProcessingTask.version last written
         self._load_tasks()
     
+    def _task_path(self, task_id: str) -> Path:
+        return self.tasks_dir / f"{task_id}.json"
+    
+    def _log_path(self, task_id: str) -> Path:
+        return self.tasks_dir / f"{task_id}.logs.jsonl"
+    
+    def _load_log_file(self, task_id: str) -> Optional[List[LogEntry]]:
+        """Read a task's log journal; None if the task has none yet (e.g. logs still inline)"""
+        path = self._log_path(task_id)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if data and not data.endswith(b"\n"):
+            # Cut a torn trailing line from an interrupted append, or the next append would be glued onto it
+            data = data[:data.rfind(b"\n") + 1]
+            os.truncate(path, len(data))
+        lines = data.splitlines()
+        try:
+            # JSONL -> JSON array, so pydantic-core validates every entry without a per-line round trip
+            return _LOGS_ADAPTER.validate_json(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            pass  # Fall back to line by line to skip a damaged entry
+        logs = []
+        for line in lines:
+            try:
+                logs.append(LogEntry.model_validate_json(line))
+            except ValueError:
+                continue  # Damaged entry
+        return logs
+    
+    def _load_task_file(self, path: str) -> Optional[ProcessingTask]:
+        try:
+            with open(path, "rb") as f:
+                task = ProcessingTask.model_validate_json(f.read())
+            logs = self._load_log_file(task.id)
+            if logs is not None:
+                task.logs = logs
+                task._index_logs()
+            return task
+        except Exception as e:
+            print(f"Error loading task file {path}: {e}")
+            return None
+    
     def _load_tasks(self):
+        with os.scandir(self.tasks_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(".json")]
+        with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as pool:
+            loaded = [task for task in pool.map(self._load_task_file, paths) if task]
+        # Keep creation order, as the old single-file store did
+        loaded.sort(key=lambda task: task.created_at)
+        self.tasks = {task.id: task for task in loaded}
+        self._saved_versions = {task.id: task.version for task in loaded}
+        # Tasks whose logs were still stored inline get them moved to the journal on next save
+        self._persisted_log_counts = {
+            task.id: len(task.logs) if self._log_path(task.id).exists() else 0 for task in loaded
+        }
+        
         if self.tasks_file.exists():
-            try:
-                with open(self.tasks_file, "r", encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tasks = {}
-                    for task_id, task_data in data.items():
-                        # Convert datetime strings back to datetime objects
-                        for key, value in task_data.items():
-                            if key in ['created_at', 'updated_at', 'completed_at'] and isinstance(value, str):
-                                try:
-                                    task_data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                                except ValueError:
-                                    pass
-                        # Handle papers list
-                        if 'papers' in task_data:
-                            for paper in task_data['papers']:
-                                for paper_key, paper_value in paper.items():
-                                    if paper_key in ['created_at', 'updated_at'] and isinstance(paper_value, str):
-                                        try:
-                                            paper[paper_key] = datetime.fromisoformat(paper_value.replace('Z', '+00:00'))
-                                        except ValueError:
-                                            pass
-                        
-                        # Handle logs list
-                        if 'logs' in task_data:
-                            for log in task_data['logs']:
-                                for log_key, log_value in log.items():
-                                    if log_key == 'timestamp' and isinstance(log_value, str):
-                                        try:
-                                            log[log_key] = datetime.fromisoformat(log_value.replace('Z', '+00:00'))
-                                        except ValueError:
-                                            pass
-                        
-                        self.tasks[task_id] = ProcessingTask(**task_data)
-            except Exception as e:
-                print(f"Error loading tasks: {e}")
-                self.tasks = {}
+            self._migrate_legacy_tasks_file()
+        self._pending_ids = dict.fromkeys(
+            task.id for task in self.tasks.values() if task.status == TaskStatus.PENDING
+        )
+    
+    def _migrate_legacy_tasks_file(self):
+        """Split the old tasks.json into per-task files, then retire it"""
+        try:
+            legacy_tasks = _TASKS_ADAPTER.validate_json(self.tasks_file.read_bytes())
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            return
+        for task_id, task in legacy_tasks.items():
+            if task_id not in self.tasks:
+                self.tasks[task_id] = task
+                self._save_task(task)
+        self.tasks_file.rename(self.tasks_file.with_name(self.tasks_file.name + ".migrated"))
+    
+    def _index_status(self, task: ProcessingTask):
+        if task.status == TaskStatus.PENDING:
+            self._pending_ids.setdefault(task.id)
         else:
-            self.tasks = {}
+            self._pending_ids.pop(task.id, None)
     
-    def _save_tasks(self):
-        """Save tasks with file locking to prevent concurrent access issues"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Convert tasks to serializable format
-                serializable_tasks = {}
-                for task_id, task in self.tasks.items():
-                    task_dict = task.dict()
-                    # Convert datetime objects to ISO format strings
-                    for key, value in task_dict.items():
-                        if isinstance(value, datetime):
-                            task_dict[key] = value.isoformat()
-                    # Handle papers list
-                    if 'papers' in task_dict:
-                        for paper in task_dict['papers']:
-                            for paper_key, paper_value in paper.items():
-                                if isinstance(paper_value, datetime):
-                                    paper[paper_key] = paper_value.isoformat()
-                    
-                    # Handle logs list
-                    if 'logs' in task_dict:
-                        for log in task_dict['logs']:
-                            for log_key, log_value in log.items():
-                                if isinstance(log_value, datetime):
-                                    log[log_key] = log_value.isoformat()
-                    
-                    serializable_tasks[task_id] = task_dict
-                
-                # Use file locking for atomic writes (Unix/macOS)
-                try:
-                    with open(self.tasks_file, "w", encoding='utf-8') as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock
-                        json.dump(serializable_tasks, f, indent=2, ensure_ascii=False)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)  # Release lock
-                    break  # Success, exit retry loop
-                except (OSError, IOError) as lock_error:
-                    # Handle systems without fcntl (like Windows) or lock contention
-                    if attempt == max_retries - 1:
-                        # Last attempt, try without locking
-                        with open(self.tasks_file, "w", encoding='utf-8') as f:
-                            json.dump(serializable_tasks, f, indent=2, ensure_ascii=False)
-                    else:
-                        # Wait and retry
-                        time.sleep(0.1 * (attempt + 1))
-                        continue
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    print(f"Error saving tasks after {max_retries} attempts: {e}")
-                else:
-                    time.sleep(0.1 * (attempt + 1))
+    def _append_new_logs(self, task: ProcessingTask):
+        """Append logs added since the last save to the task's journal"""
+        persisted = self._persisted_log_counts.get(task.id, 0)
+        new_logs = task.logs[persisted:]
+        if not new_logs:
+            return
+        with open(self._log_path(task.id), "ab") as f:
+            f.write(b"".join(entry.model_dump_json().encode() + b"\n" for entry in new_logs))
+            f.flush()
+            os.fsync(f.fileno())
+        self._persisted_log_counts[task.id] = persisted + len(new_logs)
+    
+    def _save_task(self, task: ProcessingTask):
+        """Persist a single task; untouched tasks are not rewritten"""
+        path = self._task_path(task.id)
+        tmp_path = path.with_name(path.name + ".tmp")
+        version = task.version  # Taken before serializing, so a concurrent change still counts as unsaved
+        try:
+            with self._write_lock:
+                # Logs first, so a task file never references state its journal lacks
+                self._append_new_logs(task)
+                with open(tmp_path, "wb") as f:
+                    # Defaults (empty progress, null error, ...) are refilled on load; logs live in the journal
+                    f.write(task.model_dump_json(indent=2, exclude_defaults=True, exclude={"logs"}).encode())
+                    # Make the content durable before the rename publishes it
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)  # Atomic on POSIX: readers never see a partial file
+                self._saved_versions[task.id] = version
+        except Exception as e:
+            print(f"Error saving task {task.id}: {e}")
     
     def create_task(self, title: str, input_text: str, description: Optional[str] = None) -> ProcessingTask:
-        import uuid
         task_id = str(uuid.uuid4())
         
         task = ProcessingTask(
@@ -215,13 +344,15 @@ class TaskStorage:
         )
         
         self.tasks[task_id] = task
-        self._save_tasks()
+        self._index_status(task)
+        self._save_task(task)
         return task
     
     def add_task(self, task: ProcessingTask):
         """Add an existing ProcessingTask instance to storage"""
         self.tasks[task.id] = task
-        self._save_tasks()
+        self._index_status(task)
+        self._save_task(task)
 
     def get_task(self, task_id: str) -> Optional[ProcessingTask]:
         return self.tasks.get(task_id)
@@ -229,14 +360,29 @@ class TaskStorage:
     def get_all_tasks(self) -> List[ProcessingTask]:
         return list(self.tasks.values())
     
+    def get_pending_tasks(self) -> List[ProcessingTask]:
+        """PENDING tasks, oldest first, without scanning finished ones"""
+        return [
+            task for task in map(self.tasks.get, list(self._pending_ids))
+            if task is not None and task.status == TaskStatus.PENDING
+        ]
+    
     def update_task(self, task: ProcessingTask):
-        task.updated_at = datetime.now(timezone.utc)
+        """Persist a task; a no-op if it hasn't changed since it was last saved or loaded"""
+        if self._saved_versions.get(task.id) == task.version and self.tasks.get(task.id) is task:
+            return
+        task.updated_at = _utcnow()
         self.tasks[task.id] = task
-        self._save_tasks()
+        self._index_status(task)
+        self._save_task(task)
     
     def delete_task(self, task_id: str) -> bool:
         if task_id in self.tasks:
             del self.tasks[task_id]
-            self._save_tasks()
+            self._persisted_log_counts.pop(task_id, None)
+            self._pending_ids.pop(task_id, None)
+            self._saved_versions.pop(task_id, None)
+            self._task_path(task_id).unlink(missing_ok=True)
+            self._log_path(task_id).unlink(missing_ok=True)
             return True
         return False 
\ No newline at end of file
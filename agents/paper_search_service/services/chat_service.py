@@ -2,9 +2,8 @@
 聊天服务层 - 处理与PDF的对话功能
 """
 
-import yaml
-import base64
-import requests
+import asyncio
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, AsyncGenerator
 import sys
@@ -15,21 +14,84 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(project_root))
 
 from tools.api.llm import call_llm
+from tools.config import load_config
+from tools.paper.utils import _normalize_title
 from api.models import ChatMessage, ChatResponse
-from services.paper_service import PaperService
+from services.paper_service import get_paper_service
 from datetime import datetime
 
+# PDF以URL形式作为文件附件发送，由OpenRouter的file-parser插件抓取并解析，本地不下载、不编码
+_PDF_PLUGINS = [{"id": "file-parser", "pdf": {"engine": "pdf-text"}}]
+
+# 建议的问题（与具体论文无关）
+_SUGGESTED_QUESTIONS = (
+    "这篇论文的主要贡献是什么？",
+    "论文使用了什么方法或技术？",
+    "实验结果如何？有什么重要发现？",
+    "这篇论文有什么局限性？",
+    "论文与相关工作的区别在哪里？",
+    "如何评价这篇论文的创新性？"
+)
+
+# LLM调用异常的分类：(小写匹配关键词, 提示原因)，按顺序匹配第一个
+_ERROR_REASONS = (
+    (("401", "unauthorized"), "API key 无效或已过期"),
+    (("429", "rate limit"), "API 调用频率超限，请稍后重试"),
+    (("timeout",), "网络超时，请检查网络连接"),
+)
+
+# 系统提示词中与论文无关的固定部分
+_SYSTEM_PROMPT_GUIDE = """
+
+## 你的能力
+你可以：
+1. 解释论文中的概念、方法和实验结果
+2. 回答关于论文内容的具体问题  
+3. 分析论文的创新点、优缺点和局限性
+4. 与其他相关工作进行比较分析
+5. 帮助理解复杂的技术细节和数学公式
+
+## 回答要求
+- 请用中文回答
+- 基于论文摘要和你的知识来回答问题
+- 如果问题超出了论文范围，请明确说明
+- 保持专业、准确和有帮助的语气
+- 可以适当引用论文中的具体内容
+
+请准备好回答用户关于这篇论文的问题。"""
+
+@lru_cache(maxsize=128)
+def _build_system_prompt(title: str, arxiv_id: Optional[str], summary: str, has_pdf: bool) -> str:
+    """构建系统提示词；以摘要内容为键缓存，论文重新分析后摘要变化会自动生成新提示词"""
+    parts = [
+        f"""你是一个专业的学术论文助手。你正在帮助用户理解和分析以下论文：
+
+## 论文信息
+- **标题**: {title}
+- **arXiv ID**: {arxiv_id or 'N/A'}
+
+## 论文AI摘要
+""",
+        summary,
+        _SYSTEM_PROMPT_GUIDE,
+    ]
+
+    # 如果有PDF，全文会作为附件随对话发送
+    if has_pdf:
+        parts.append("\n\n## PDF内容\n论文PDF全文已作为附件提供，可以直接引用其中的内容。")
+    return "".join(parts)
+
 class ChatService:
     def __init__(self):
         self.project_root = project_root
-        self.paper_service = PaperService()
+        self.paper_service = get_paper_service()
         self.config = self._load_config()
+        # 限制同时进行的LLM调用数，超出的请求排队等待，避免并发请求压垮上游服务
+        self._llm_slots = asyncio.Semaphore(max(1, self.config.get('max_chat_concurrent', 8)))
         
     def _load_config(self) -> Dict:
-        """加载配置文件"""
-        config_path = self.project_root / "config" / "config.yaml"
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        """加载配置文件（进程内共享缓存，文件修改后自动重新解析）"""
+        return load_config()
     
     def _get_chat_llm_config(self) -> Dict:
         """获取聊天用的LLM配置 - 使用gemini 2.5 flash"""
@@ -46,49 +108,30 @@ class ChatService:
         
         return llm_config
 
-    def _get_pdf_content_base64(self, pdf_url: str) -> Optional[str]:
-        """获取PDF文件的base64内容"""
-        try:
-            response = requests.get(pdf_url, timeout=30)
-            response.raise_for_status()
-            return base64.b64encode(response.content).decode('utf-8')
-        except Exception as e:
-            logging.error(f"Failed to fetch PDF from {pdf_url}: {e}")
-            return None
-
-    def _create_system_prompt(self, paper_detail, pdf_base64: Optional[str] = None) -> str:
+    def _create_system_prompt(self, paper_detail) -> str:
         """创建系统提示词"""
-        system_prompt = f"""你是一个专业的学术论文助手。你正在帮助用户理解和分析以下论文：
-
-## 论文信息
-- **标题**: {paper_detail.title}
-- **arXiv ID**: {paper_detail.arxiv_id or 'N/A'}
+        return _build_system_prompt(paper_detail.title, paper_detail.arxiv_id,
+                                    paper_detail.summary, bool(paper_detail.pdf_url))
 
-## 论文AI摘要
-{paper_detail.summary}
-
-## 你的能力
-你可以：
-1. 解释论文中的概念、方法和实验结果
-2. 回答关于论文内容的具体问题  
-3. 分析论文的创新点、优缺点和局限性
-4. 与其他相关工作进行比较分析
-5. 帮助理解复杂的技术细节和数学公式
-
-## 回答要求
-- 请用中文回答
-- 基于论文摘要和你的知识来回答问题
-- 如果问题超出了论文范围，请明确说明
-- 保持专业、准确和有帮助的语气
-- 可以适当引用论文中的具体内容
-
-请准备好回答用户关于这篇论文的问题。"""
+    def _create_pdf_message(self, paper_detail) -> Dict:
+        """以文件附件形式引用论文PDF的消息（只传URL，由LLM服务端抓取）"""
+        return {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "这是论文的PDF全文。"},
+                {
+                    "type": "file",
+                    "file": {
+                        "filename": f"{_normalize_title(paper_detail.title)}.pdf",
+                        "file_data": paper_detail.pdf_url
+                    }
+                }
+            ]
+        }
 
-        # 如果有PDF内容，可以在这里添加
-        if pdf_base64:
-            system_prompt += f"\n\n## PDF内容\n[PDF文件已加载，包含{len(pdf_base64)}字符的base64数据]"
-            
-        return system_prompt
+    def _get_system_prompt(self, paper_id: str, paper_detail) -> str:
+        """获取论文的系统提示词，摘要未变化时复用缓存（最多缓存128篇）"""
+        return self._create_system_prompt(paper_detail)
 
     async def start_conversation(self, paper_id: str) -> Dict:
         """开始新的对话"""
@@ -97,23 +140,22 @@ class ChatService:
         if not paper_detail:
             raise ValueError(f"Paper with ID {paper_id} not found")
         
-        # 获取PDF内容（可选）
-        pdf_base64 = None
-        if paper_detail.pdf_url:
-            pdf_base64 = self._get_pdf_content_base64(paper_detail.pdf_url)
-        
         # 创建系统提示词
-        system_prompt = self._create_system_prompt(paper_detail, pdf_base64)
+        system_prompt = self._get_system_prompt(paper_id, paper_detail)
         
         return {
             "paper_detail": paper_detail,
             "system_prompt": system_prompt,
-            "pdf_available": pdf_base64 is not None,
+            "pdf_available": bool(paper_detail.pdf_url),
             "conversation_started": True
         }
 
-    async def send_message(self, message: str, paper_id: str, conversation_history: List[Dict]) -> ChatResponse:
-        """发送消息并获取回复"""
+    async def send_message(self, message: str, paper_id: str, conversation_history: List[Dict],
+                           *, system_prompt: Optional[str] = None) -> ChatResponse:
+        """发送消息并获取回复
+
+        system_prompt 为空时使用按 paper_id 缓存的系统提示词（首次对话时构建）。
+        """
         # 获取论文详情
         paper_detail = self.paper_service.get_paper_by_id(paper_id)
         if not paper_detail:
@@ -130,27 +172,25 @@ class ChatService:
                 timestamp=datetime.now()
             )
         
-        # 构建消息历史
-        messages = []
-        
-        # 添加系统提示词
-        pdf_base64 = None
+        # 构建消息历史：系统提示词 + PDF附件（可选） + 对话历史 + 当前用户消息
+        if system_prompt is None:
+            system_prompt = self._get_system_prompt(paper_id, paper_detail)
+        head = [{"role": "system", "content": system_prompt}]
+        plugins = None
         if paper_detail.pdf_url:
-            pdf_base64 = self._get_pdf_content_base64(paper_detail.pdf_url)
-        
-        system_prompt = self._create_system_prompt(paper_detail, pdf_base64)
-        messages.append({"role": "system", "content": system_prompt})
-        
-        # 添加对话历史
-        for msg in conversation_history:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        
-        # 添加当前用户消息
-        messages.append({"role": "user", "content": message})
+            head.append(self._create_pdf_message(paper_detail))
+            plugins = _PDF_PLUGINS
+        messages = (
+            head
+            + [{"role": msg["role"], "content": msg["content"]} for msg in conversation_history]
+            + [{"role": "user", "content": message}]
+        )
         
         # 调用LLM
         try:
-            response_message, usage = call_llm(llm_config, messages, is_json=False)
+            # call_llm 是阻塞的HTTP调用，放到线程中执行，其他请求可并发处理
+            async with self._llm_slots:
+                response_message, usage = await asyncio.to_thread(call_llm, llm_config, messages, is_json=False, plugins=plugins)
             
             if response_message and 'content' in response_message:
                 return ChatResponse(
@@ -166,28 +206,24 @@ class ChatService:
                 
         except Exception as e:
             logging.error(f"Error in chat service: {e}")
-            error_msg = "🤖 处理您的消息时出现了错误"
-            if "401" in str(e) or "unauthorized" in str(e).lower():
-                error_msg += "：API key 无效或已过期"
-            elif "429" in str(e) or "rate limit" in str(e).lower():
-                error_msg += "：API 调用频率超限，请稍后重试"
-            elif "timeout" in str(e).lower():
-                error_msg += "：网络超时，请检查网络连接"
-            else:
-                error_msg += f"：{str(e)}"
+            error_text = str(e)
+            error_text_lower = error_text.lower()
+            reason = next(
+                (reason for markers, reason in _ERROR_REASONS if any(m in error_text_lower for m in markers)),
+                error_text
+            )
             
             return ChatResponse(
-                message=error_msg,
+                message=f"🤖 处理您的消息时出现了错误：{reason}",
                 timestamp=datetime.now()
             )
 
     def get_suggested_questions(self, paper_detail) -> List[str]:
         """获取建议的问题列表"""
-        return [
-            "这篇论文的主要贡献是什么？",
-            "论文使用了什么方法或技术？",
-            "实验结果如何？有什么重要发现？",
-            "这篇论文有什么局限性？",
-            "论文与相关工作的区别在哪里？",
-            "如何评价这篇论文的创新性？"
-        ] 
\ No newline at end of file
+        return list(_SUGGESTED_QUESTIONS)
+
+
+@lru_cache(maxsize=1)
+def get_chat_service() -> ChatService:
+    """进程内共享的ChatService实例（系统提示词缓存随之共享）"""
+    return ChatService()
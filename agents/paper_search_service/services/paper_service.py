@@ -2,11 +2,11 @@
 论文服务层 - 复用现有的论文处理逻辑
 """
 
-import json
+from functools import lru_cache
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import sys
 
 # 添加项目根目录到Python路径
@@ -14,12 +14,20 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(project_root))
 
 from api.models import PaperSummary, PaperDetail, PapersListResponse
+from tools.paper.cache import cache_stamp, load_cache
 
 class PaperService:
     def __init__(self):
         self.project_root = project_root
         self.agent_storage_path = self.project_root / 'storage' / 'paper_search_agent'
         self.cache_path = self.agent_storage_path / 'cache.json'
+        # 内存缓存，以cache.json及cache.jsonl的(mtime, size)作为失效依据
+        self._cache: Dict = {}
+        self._cache_stamp: Optional[Tuple] = None
+        self._papers: Optional[PapersListResponse] = None
+        self._by_display_title: Dict[str, Dict] = {}
+        self._by_arxiv_id: Dict[str, Dict] = {}
+        self._by_title: Dict[str, Dict] = {}
 
     def format_collection_time(self, collected_at_str: str) -> str:
         """格式化收集时间"""
@@ -31,15 +39,27 @@ class PaperService:
             return "Unknown"
 
     def load_cache(self) -> Dict:
-        """加载缓存文件"""
-        if self.cache_path.exists():
-            with open(self.cache_path, 'r') as f:
-                return json.load(f)
-        return {}
+        """加载缓存文件（快照 + 代理的追加日志），两者都未变化时直接返回内存中的结果"""
+        stamp = cache_stamp(self.cache_path)
+        if stamp is None:
+            self._cache, self._cache_stamp, self._papers = {}, None, None
+            self._build_indices(self._cache)
+            return self._cache
+
+        if stamp != self._cache_stamp:
+            # 代理运行期间最新结果只在cache.jsonl中，需一并回放
+            self._cache = load_cache(self.cache_path)
+            self._cache_stamp = stamp
+            self._papers = None
+            self._build_indices(self._cache)
+        return self._cache
 
     def load_papers_data(self) -> PapersListResponse:
         """加载论文数据，返回格式化的列表"""
         cache = self.load_cache()
+        if self._papers is not None:
+            return self._papers
+
         papers = []
         
         for key, paper in cache.items():
@@ -48,9 +68,7 @@ class PaperService:
                 continue
                 
             collected_at = paper.get('collected_at', '')
-            formatted_time = self.format_collection_time(collected_at)
-            
-            display_title = f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
+            display_title = self._make_display_title(paper)
             
             paper_summary = PaperSummary(
                 arxiv_id=paper.get('arxiv_id'),
@@ -65,110 +83,66 @@ class PaperService:
         # 按收集时间排序（最新的在前）
         papers.sort(key=lambda x: x.collected_at, reverse=True)
         
-        return PapersListResponse(papers=papers, total=len(papers))
+        self._papers = PapersListResponse(papers=papers, total=len(papers))
+        return self._papers
+
+    def _make_display_title(self, paper: Dict) -> str:
+        """生成列表中展示用的标题"""
+        formatted_time = self.format_collection_time(paper.get('collected_at', ''))
+        return f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
+
+    def _build_indices(self, cache: Dict):
+        """根据缓存构建display_title / arxiv_id / title索引（同名时保留第一条，与线性查找一致）"""
+        by_display_title, by_arxiv_id, by_title = {}, {}, {}
+        for paper in cache.values():
+            by_display_title.setdefault(self._make_display_title(paper), paper)
+            if paper.get('arxiv_id'):
+                by_arxiv_id.setdefault(paper['arxiv_id'], paper)
+            if paper.get('title'):
+                by_title.setdefault(paper['title'], paper)
+        self._by_display_title = by_display_title
+        self._by_arxiv_id = by_arxiv_id
+        self._by_title = by_title
+
+    def _build_paper_detail(self, paper: Dict) -> PaperDetail:
+        """读取摘要内容并组装论文详情"""
+        summary_content = "### No summary available for this paper."
+        summary_path_str = paper.get('summary_path')
+        if summary_path_str:
+            summary_path = self.project_root / summary_path_str
+            if summary_path.exists():
+                summary_content = summary_path.read_text()
+            else:
+                summary_content = f"### Summary file not found at:\n`{summary_path_str}`"
+
+        return PaperDetail(
+            arxiv_id=paper.get('arxiv_id'),
+            title=paper.get('title', 'No Title'),
+            display_title=self._make_display_title(paper),
+            pdf_url=paper.get('pdf_url'),
+            summary=summary_content,
+            collected_at=paper.get('collected_at', '')
+        )
 
     def get_paper_by_display_title(self, display_title: str) -> Optional[PaperDetail]:
         """根据显示标题获取论文详情"""
-        cache = self.load_cache()
-        
-        # 找到匹配的论文
-        for paper in cache.values():
-            collected_at = paper.get('collected_at', '')
-            formatted_time = self.format_collection_time(collected_at)
-            paper_display_title = f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
-            
-            if paper_display_title == display_title:
-                # 读取摘要内容
-                summary_content = "### No summary available for this paper."
-                summary_path_str = paper.get('summary_path')
-                if summary_path_str:
-                    summary_path = self.project_root / summary_path_str
-                    if summary_path.exists():
-                        summary_content = summary_path.read_text()
-                    else:
-                        summary_content = f"### Summary file not found at:\n`{summary_path_str}`"
-                
-                return PaperDetail(
-                    arxiv_id=paper.get('arxiv_id'),
-                    title=paper.get('title', 'No Title'),
-                    display_title=paper_display_title,
-                    pdf_url=paper.get('pdf_url'),
-                    summary=summary_content,
-                    collected_at=collected_at
-                )
-        
-        return None
+        self.load_cache()
+        paper = self._by_display_title.get(display_title)
+        return self._build_paper_detail(paper) if paper else None
 
     def get_paper_by_arxiv_id(self, arxiv_id: str) -> Optional[PaperDetail]:
         """根据arXiv ID获取论文详情"""
-        cache = self.load_cache()
-        
-        for paper in cache.values():
-            if paper.get('arxiv_id') == arxiv_id:
-                # 读取摘要内容
-                summary_content = "### No summary available for this paper."
-                summary_path_str = paper.get('summary_path')
-                if summary_path_str:
-                    summary_path = self.project_root / summary_path_str
-                    if summary_path.exists():
-                        summary_content = summary_path.read_text()
-                    else:
-                        summary_content = f"### Summary file not found at:\n`{summary_path_str}`"
-                
-                # 生成display_title
-                collected_at = paper.get('collected_at', '')
-                formatted_time = self.format_collection_time(collected_at)
-                display_title = f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
-                
-                return PaperDetail(
-                    arxiv_id=paper.get('arxiv_id'),
-                    title=paper.get('title', 'No Title'),
-                    display_title=display_title,
-                    pdf_url=paper.get('pdf_url'),
-                    summary=summary_content,
-                    collected_at=paper.get('collected_at', '')
-                )
-        
-        return None
+        self.load_cache()
+        paper = self._by_arxiv_id.get(arxiv_id)
+        return self._build_paper_detail(paper) if paper else None
 
     def get_paper_by_id(self, paper_id: str) -> Optional[PaperDetail]:
         """
         根据paper_id获取论文详情（先尝试arxiv_id，再尝试title）
         """
-        # 首先尝试使用arxiv_id查找
-        paper = self.get_paper_by_arxiv_id(paper_id)
-        if paper:
-            return paper
-        
-        # 如果没找到，尝试使用title查找
-        cache = self.load_cache()
-        for cached_paper in cache.values():
-            if cached_paper.get('title') == paper_id:
-                # 读取摘要内容
-                summary_content = "### No summary available for this paper."
-                summary_path_str = cached_paper.get('summary_path')
-                if summary_path_str:
-                    summary_path = self.project_root / summary_path_str
-                    if summary_path.exists():
-                        summary_content = summary_path.read_text()
-                    else:
-                        summary_content = f"### Summary file not found at:\n`{summary_path_str}`"
-                
-                # 生成display_title
-                collected_at = cached_paper.get('collected_at', '')
-                formatted_time = self.format_collection_time(collected_at)
-                display_title = f"[{cached_paper.get('arxiv_id', 'N/A')}] {cached_paper.get('title', 'No Title')} | 📅 {formatted_time}"
-                
-                return PaperDetail(
-                    arxiv_id=cached_paper.get('arxiv_id'),
-                    title=cached_paper.get('title', 'No Title'),
-                    display_title=display_title,
-                    pdf_url=cached_paper.get('pdf_url'),
-                    summary=summary_content,
-                    collected_at=cached_paper.get('collected_at', '')
-                )
-        
-        return None
+        self.load_cache()
+        paper = self._by_arxiv_id.get(paper_id) or self._by_title.get(paper_id)
+        return self._build_paper_detail(paper) if paper else None
 
     def search_papers(self, keyword: str) -> PapersListResponse:
         """搜索论文"""
@@ -183,4 +157,10 @@ class PaperService:
             if keyword.lower() in paper.display_title.lower()
         ]
         
-        return PapersListResponse(papers=filtered_papers, total=len(filtered_papers)) 
\ No newline at end of file
+        return PapersListResponse(papers=filtered_papers, total=len(filtered_papers))
+
+
+@lru_cache(maxsize=1)
+def get_paper_service() -> PaperService:
+    """进程内共享的PaperService实例，缓存数据与索引在各路由和服务之间复用"""
+    return PaperService() 
\ No newline at end of file
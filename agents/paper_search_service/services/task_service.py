@@ -1,24 +1,42 @@
+import hashlib
 import logging
+import os
+import re
 from pathlib import Path
 import sys
-import yaml
-import json
+import orjson
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(project_root))
 
 from tools.api.llm import call_llm
+from tools.api.ratelimit import bucket_from_config
+from tools.config import load_config
 from tools.paper.search import find_paper_details
-from tools.paper.utils import _normalize_title
+from tools.paper.utils import _load_prompt
 from tools.paper.analyze import analyze_paper
+from tools.paper.cache import cache_stamp, load_cache
 from tools.trackers import update_usage
 from models.task import ProcessingTask, PaperTask, TaskStatus, PaperStatus, TaskStorage
 
+# Error substrings that mark a paper failure as permanent (not worth retrying)
+_PERMANENT_ERROR_RE = re.compile(r'not found|does not exist|404|invalid url|malformed', re.IGNORECASE)
+
+# Reading page cache shared with the paper search agent and the reading pages
+_READING_CACHE_PATH = project_root / 'storage' / 'paper_search_agent' / 'cache.json'
+
+# PDF fingerprint -> summary path of an earlier analysis, so the same PDF is never summarized twice
+_ANALYSIS_MEMO_PATH = project_root / 'storage' / 'paper_search_agent' / 'analysis_memo.json'
+
+# Per-paper progress is persisted at most this often (seconds); status transitions are written immediately
+_FLUSH_INTERVAL = 0.5
+
 class TaskProcessor:
     """Service for processing paper collection and analysis tasks."""
     def __init__(self, storage_dir: Path):
@@ -26,18 +44,35 @@ class TaskProcessor:
         self.task_storage = TaskStorage(storage_dir)
         self.config = self._load_config()
         self.usage_tracker = {}
-        self._current_processing_task = None  # Track the currently processing task
+        # Paces lookups and analysis LLM calls to the configured quotas (None when unlimited)
+        self._recall_bucket = bucket_from_config(self.config, 'recall_requests_per_second')
+        self._analysis_bucket = bucket_from_config(self.config, 'analysis_requests_per_minute', per=60.0)
+        self._active_tasks = set()  # Ids of tasks currently being processed
+        self._max_active_tasks = max(1, self.config.get('max_concurrent_tasks', 2))
         self._processing_lock = threading.Lock()  # Thread safety for processing state
+        self._wake = threading.Event()  # Set when a task is queued or a slot frees up
+        self._reading_cache_lock = threading.RLock()  # Guards the in-memory reading cache and cache.json writes
+        self._reading_cache = None  # Parsed cache.json, loaded on first use
+        self._reading_cache_stamp = None  # (mtime_ns, size) of cache.json when last read or written
+        self._reading_cache_pending = {}  # Entries added in memory but not yet written to cache.json
+        self._analysis_memo = None  # Parsed analysis_memo.json, loaded on first use
+        self._analysis_memo_lock = threading.Lock()
         self._scheduler_running = False
         self._scheduler_thread = None
+        # task id -> (_status_stamp, dict) for the polled status endpoints
+        self._status_cache: Dict[str, Tuple[Tuple[int, datetime], Dict[str, Any]]] = {}
+        self._summary_cache: Dict[str, Tuple[Tuple[int, datetime], Dict[str, Any]]] = {}
+        self._dirty_task_ids = set()  # Tasks with per-paper changes not yet persisted
+        self._dirty_lock = threading.Lock()
+        self._dirty_event = threading.Event()
+        self._flusher_thread = threading.Thread(target=self._flusher_loop, daemon=True)
+        self._flusher_thread.start()
         
         # Start the scheduler
         self.start_scheduler()
 
     def _load_config(self) -> Dict[str, Any]:
-        config_path = project_root / 'config' / 'config.yaml'
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        return load_config()
 
     def start_scheduler(self):
         """Start the background task scheduler"""
@@ -52,61 +87,190 @@ class TaskProcessor:
     def stop_scheduler(self):
         """Stop the background task scheduler"""
         self._scheduler_running = False
+        self._wake.set()
         if self._scheduler_thread and self._scheduler_thread.is_alive():
             self._scheduler_thread.join(timeout=5.0)
+        self._flush_dirty_tasks()
         logging.info("Task scheduler stopped")
 
+    def notify_new_task(self):
+        """Wake the scheduler so a newly queued task starts without waiting for the next poll"""
+        self._wake.set()
+
+    def _mark_dirty(self, task: ProcessingTask):
+        """Schedule a debounced save of a task's per-paper progress"""
+        with self._dirty_lock:
+            self._dirty_task_ids.add(task.id)
+        self._dirty_event.set()
+
+    def _flush_dirty_tasks(self):
+        with self._dirty_lock:
+            task_ids, self._dirty_task_ids = self._dirty_task_ids, set()
+        for task_id in task_ids:
+            task = self.task_storage.get_task(task_id)
+            if task:
+                self.task_storage.update_task(task)
+        with self._reading_cache_lock:
+            if self._reading_cache_pending:
+                try:
+                    self._save_reading_cache()
+                except Exception as e:
+                    logging.error(f"Failed to save reading cache: {e}")
+
+    def _flusher_loop(self):
+        """Background loop coalescing per-paper task saves into one write per interval"""
+        while True:
+            self._dirty_event.wait()
+            time.sleep(_FLUSH_INTERVAL)
+            self._dirty_event.clear()
+            try:
+                self._flush_dirty_tasks()
+            except Exception as e:
+                logging.error(f"Error flushing task updates: {e}")
+
+    @staticmethod
+    def _reading_cache_file_stamp():
+        return cache_stamp(_READING_CACHE_PATH)
+
+    def _get_reading_cache(self) -> Dict[str, Any]:
+        """The parsed reading cache; call with `_reading_cache_lock` held.
+
+        cache.json and its journal are only re-read when either changed on disk since we last
+        read or wrote them (e.g. the command-line agent added papers), not once per paper.
+        """
+        stamp = self._reading_cache_file_stamp()
+        if self._reading_cache is None or stamp != self._reading_cache_stamp:
+            cache = {}
+            if stamp is not None:
+                try:
+                    # Replays the agent's journal, which holds its latest results between snapshots
+                    cache = load_cache(_READING_CACHE_PATH)
+                except Exception as e:
+                    logging.warning(f"Failed to load existing cache: {e}")
+            # Keep our not-yet-written entries on top of whatever is on disk now
+            for cache_key, entry in self._reading_cache_pending.items():
+                cache.setdefault(cache_key, entry)
+            self._reading_cache = cache
+            self._reading_cache_stamp = stamp
+        return self._reading_cache
+
+    @staticmethod
+    def _analysis_memo_key(paper_dict: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint of what a summary is derived from (the PDF), independent of how the title is spelled"""
+        pdf_url = paper_dict.get('pdf_url')
+        if not pdf_url:
+            return None
+        return hashlib.sha256(f"{paper_dict.get('arxiv_id') or ''}|{pdf_url}".encode()).hexdigest()
+
+    def _get_analysis_memo(self) -> Dict[str, str]:
+        """The parsed analysis memo; call with `_analysis_memo_lock` held"""
+        if self._analysis_memo is None:
+            try:
+                self._analysis_memo = orjson.loads(_ANALYSIS_MEMO_PATH.read_bytes())
+            except FileNotFoundError:
+                self._analysis_memo = {}
+            except Exception as e:
+                logging.warning(f"Failed to load analysis memo: {e}")
+                self._analysis_memo = {}
+        return self._analysis_memo
+
+    def _lookup_analysis_memo(self, memo_key: Optional[str]) -> Optional[str]:
+        """Summary path of an earlier analysis of the same PDF, if its file still exists"""
+        if memo_key is None:
+            return None
+        with self._analysis_memo_lock:
+            summary_path = self._get_analysis_memo().get(memo_key)
+        if summary_path and (project_root / summary_path).exists():
+            return summary_path
+        return None
+
+    def _remember_analysis(self, memo_key: Optional[str], summary_path: str):
+        if memo_key is None:
+            return
+        with self._analysis_memo_lock:
+            memo = self._get_analysis_memo()
+            memo[memo_key] = summary_path
+            try:
+                _ANALYSIS_MEMO_PATH.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = _ANALYSIS_MEMO_PATH.with_name(_ANALYSIS_MEMO_PATH.name + '.tmp')
+                tmp_path.write_bytes(orjson.dumps(memo, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_path, _ANALYSIS_MEMO_PATH)
+            except Exception as e:
+                logging.warning(f"Failed to save analysis memo: {e}")
+
+    def _save_reading_cache(self):
+        """Write the in-memory reading cache to cache.json; call with `_reading_cache_lock` held"""
+        cache = self._get_reading_cache()  # Picks up outside edits since the last read
+        _READING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _READING_CACHE_PATH.with_name(_READING_CACHE_PATH.name + '.tmp')
+        tmp_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, _READING_CACHE_PATH)  # Readers never see a half-written cache.json
+        self._reading_cache_stamp = self._reading_cache_file_stamp()
+        self._reading_cache_pending.clear()
+
     def _scheduler_loop(self):
-        """Background scheduler loop that processes pending tasks"""
+        """Background scheduler loop that starts pending tasks while processing slots are free"""
         while self._scheduler_running:
             try:
-                # Check if we can process a new task
                 with self._processing_lock:
-                    if self._current_processing_task is None:
-                        # Find the oldest pending task
+                    while len(self._active_tasks) < self._max_active_tasks:
+                        # Find the oldest pending task not already claimed
                         pending_task = self._get_next_pending_task()
-                        if pending_task:
-                            logging.info(f"Scheduler starting task: {pending_task.id} - {pending_task.title}")
-                            # Process task in a separate thread to avoid blocking the scheduler
-                            process_thread = threading.Thread(
-                                target=self._process_task_wrapper, 
-                                args=(pending_task.id,),
-                                daemon=True
-                            )
-                            process_thread.start()
+                        if not pending_task:
+                            break
+                        # Claim before starting the thread, so the next pass can't pick the same task
+                        self._active_tasks.add(pending_task.id)
+                        logging.info(f"Scheduler starting task: {pending_task.id} - {pending_task.title}")
+                        # Process task in a separate thread to avoid blocking the scheduler
+                        process_thread = threading.Thread(
+                            target=self._process_task_wrapper, 
+                            args=(pending_task.id,),
+                            daemon=True
+                        )
+                        process_thread.start()
                 
-                # Sleep for a short interval before checking again
-                time.sleep(2.0)  # Check every 2 seconds
+                # Sleep until a task is queued or a slot frees up; the timeout is only a safety net
+                self._wake.wait(timeout=30.0)
+                self._wake.clear()
                 
             except Exception as e:
                 logging.error(f"Error in scheduler loop: {e}")
                 time.sleep(5.0)  # Wait longer on error
 
-    def _get_next_pending_task(self) -> ProcessingTask:
-        """Get the next pending task to process (oldest first)"""
-        all_tasks = self.task_storage.get_all_tasks()
-        pending_tasks = [task for task in all_tasks if task.status == TaskStatus.PENDING]
-        
-        if pending_tasks:
-            # Sort by creation time (oldest first)
-            pending_tasks.sort(key=lambda t: t.created_at)
-            return pending_tasks[0]
-        
-        return None
+    def _get_next_pending_task(self) -> Optional[ProcessingTask]:
+        """Get the next unclaimed pending task to process (oldest first)"""
+        return next(
+            (task for task in self.task_storage.get_pending_tasks() if task.id not in self._active_tasks),
+            None
+        )
 
-    def _process_task_wrapper(self, task_id: str):
-        """Wrapper for task processing with proper error handling"""
+    def _process_task_wrapper(self, task_id: str) -> bool:
+        """Runs a claimed task and always releases its slot"""
         try:
-            self.process_task(task_id)
+            return self._run_task(task_id)
         except Exception as e:
             logging.error(f"Error in task processing wrapper for {task_id}: {e}")
-            # Make sure we release the lock even if processing fails
+            return False
+        finally:
             with self._processing_lock:
-                if self._current_processing_task == task_id:
-                    self._current_processing_task = None
+                self._active_tasks.discard(task_id)
+            self._wake.set()
 
     def process_task(self, task_id: str) -> bool:
         """Process a single task through all stages synchronously"""
+        # Atomically claim a slot to prevent concurrent processing of the same task
+        with self._processing_lock:
+            if task_id in self._active_tasks:
+                logging.warning(f"Task {task_id} is already being processed")
+                return False
+            if len(self._active_tasks) >= self._max_active_tasks:
+                logging.warning(f"Task {task_id} cannot be processed: all {self._max_active_tasks} processing slots are busy")
+                return False
+            self._active_tasks.add(task_id)
+        return self._process_task_wrapper(task_id)
+
+    def _run_task(self, task_id: str) -> bool:
+        """Run a claimed task through all stages"""
         task = self.task_storage.get_task(task_id)
         if not task:
             logging.error(f"Task {task_id} not found")
@@ -117,14 +281,6 @@ class TaskProcessor:
             logging.warning(f"Task {task_id} is not in pending status (current: {task.status}), skipping processing")
             return False
         
-        # Atomically update status to prevent concurrent processing
-        with self._processing_lock:
-            if self._current_processing_task is not None:
-                logging.warning(f"Task {task_id} cannot be processed: another task {self._current_processing_task} is already being processed")
-                return False
-            
-            self._current_processing_task = task_id
-        
         task.update_status(TaskStatus.FORMATTING_INPUT)
         task.add_log("INIT", "INFO", f"Starting task processing: {task.title}")
         self.task_storage.update_task(task)
@@ -135,12 +291,13 @@ class TaskProcessor:
             self._analyze_papers(task)
             
             # Update reading page cache with completed papers
-            self._update_reading_cache(task)
+            with self._reading_cache_lock:
+                self._update_reading_cache(task)
             
             # Check if task should be marked as completed or failed
-            completed_papers = sum(1 for paper in task.papers if paper.status == PaperStatus.COMPLETED)
-            failed_papers = sum(1 for paper in task.papers if paper.status == PaperStatus.FAILED)
-            pending_papers = sum(1 for paper in task.papers if paper.status == PaperStatus.PENDING)
+            completed_papers = task.count_papers(PaperStatus.COMPLETED)
+            failed_papers = task.count_papers(PaperStatus.FAILED)
+            pending_papers = task.count_papers(PaperStatus.PENDING)
             
             if pending_papers > 0:
                 # Still have pending papers - this shouldn't happen in normal flow
@@ -166,10 +323,6 @@ class TaskProcessor:
             task.update_status(TaskStatus.FAILED)
             self.task_storage.update_task(task)
             return False
-        finally:
-            # Always clear the current processing task
-            with self._processing_lock:
-                self._current_processing_task = None
 
     def _format_input(self, task: ProcessingTask):
         # Status already set in process_task to prevent race condition
@@ -180,8 +333,7 @@ class TaskProcessor:
         step_config_name = '1_input_formatting'
         llm_name = self.config['agents']['paper_search_agent'][step_config_name]
         llm_config = self.config['llms'][llm_name]
-        prompt_path = project_root / 'prompts' / 'paper_search_agent' / f'{step_config_name}.md'
-        prompt_template = prompt_path.read_text()
+        prompt_template = _load_prompt('paper_search_agent', step_config_name)
         
         # Log the input being processed
         task.add_log("FORMAT_INPUT", "INFO", f"Processing input text with {len(task.input_text)} characters", {
@@ -207,9 +359,9 @@ class TaskProcessor:
             if message and 'content' in message:
                 try:
                     content = message['content']
-                    formatted_data = json.loads(content)
+                    formatted_data = orjson.loads(content)
                     papers = formatted_data.get('papers', [])
-                    task.papers = [PaperTask(title=paper['title'], url=paper.get('url')) for paper in papers]
+                    task.set_papers([PaperTask(title=paper['title'], url=paper.get('url')) for paper in papers])
                     
                     # Log the formatted results
                     task.add_log("FORMAT_INPUT", "INFO", f"Successfully formatted {len(task.papers)} papers", {
@@ -219,7 +371,7 @@ class TaskProcessor:
                     })
                     
                     logging.info(f"Formatted {len(task.papers)} papers")
-                except (json.JSONDecodeError, KeyError) as e:
+                except (orjson.JSONDecodeError, KeyError) as e:
                     error_msg = f"Error parsing LLM response: {e}"
                     task.add_log("FORMAT_INPUT", "ERROR", error_msg, {
                         "raw_response": content[:500] if content else None,
@@ -234,7 +386,7 @@ class TaskProcessor:
                 })
                 raise Exception(error_msg)
         except Exception as e:
-            if not any(log.level == "ERROR" for log in task.logs if log.stage == "FORMAT_INPUT"):
+            if not task.has_error_log("FORMAT_INPUT"):
                 task.add_log("FORMAT_INPUT", "ERROR", f"Unexpected error during formatting: {str(e)}", {
                     "exception": str(e)
                 })
@@ -248,75 +400,12 @@ class TaskProcessor:
         self.task_storage.update_task(task)
         logging.info(f"Searching papers for task {task.id}")
         
-        # Process papers sequentially (no concurrency)
-        successful_searches = 0
-        failed_searches = 0
-        
-        for i, paper in enumerate(task.papers):
-            try:
-                paper.status = PaperStatus.SEARCHING
-                paper.updated_at = datetime.now(timezone.utc)
-                
-                task.add_log("SEARCH_PAPERS", "INFO", f"Starting search for paper {i+1}/{len(task.papers)}: {paper.title[:100]}...", {
-                    "paper_index": i,
-                    "paper_title": paper.title,
-                    "initial_url": paper.url
-                })
-                self.task_storage.update_task(task)
-                
-                paper_dict = {"title": paper.title, "url": paper.url}
-                details = find_paper_details(paper_dict, self.config, self.usage_tracker)
-                
-                if details:
-                    paper.url = details.get('pdf_url', paper.url)
-                    # Ensure details are JSON serializable
-                    serializable_details = {}
-                    for k, v in details.items():
-                        if isinstance(v, (str, int, float, bool, list, dict)) or v is None:
-                            serializable_details[k] = v
-                        else:
-                            serializable_details[k] = str(v)
-                    paper.progress['search'] = serializable_details
-                    paper.status = PaperStatus.SEARCH_COMPLETED  # Search done, ready for analysis
-                    successful_searches += 1
-                    
-                    task.add_log("SEARCH_PAPERS", "INFO", f"Successfully found details for paper {i+1}: {paper.title[:100]}...", {
-                        "paper_index": i,
-                        "paper_title": paper.title,
-                        "found_url": paper.url,
-                        "arxiv_id": details.get('arxiv_id'),
-                        "authors": details.get('authors', [])[:3] if details.get('authors') else [],
-                        "search_method": details.get('search_method', 'unknown')
-                    })
-                    logging.info(f"Found details for: {paper.title}")
-                else:
-                    paper.status = PaperStatus.FAILED
-                    paper.error = "Failed to find paper details"
-                    failed_searches += 1
-                    task.add_log("SEARCH_PAPERS", "WARNING", f"Failed to find details for paper {i+1}: {paper.title[:100]}...", {
-                        "paper_index": i,
-                        "paper_title": paper.title,
-                        "error": "No matching paper found in search databases"
-                    })
-                    logging.warning(f"Failed to find details for: {paper.title}")
-                
-                paper.updated_at = datetime.now(timezone.utc)
-                self.task_storage.update_task(task)
-                
-            except Exception as e:
-                error_msg = f"Error searching paper {paper.title}: {e}"
-                logging.error(error_msg)
-                task.add_log("SEARCH_PAPERS", "ERROR", f"Search error for paper {i+1}: {paper.title[:100]}...", {
-                    "paper_index": i,
-                    "paper_title": paper.title,
-                    "exception": str(e),
-                    "error_type": type(e).__name__
-                })
-                paper.status = PaperStatus.FAILED
-                paper.error = str(e)
-                paper.updated_at = datetime.now(timezone.utc)
-                failed_searches += 1
-                self.task_storage.update_task(task)
+        # Lookups are network-bound and independent, so run them on a bounded thread pool
+        concurrency = self.config.get('recall_concurrency', 5)
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(task.papers)))) as pool:
+            results = list(pool.map(lambda item: self._search_single_paper(task, *item), enumerate(task.papers)))
+        successful_searches = sum(results)
+        failed_searches = len(results) - successful_searches
         
         # Log overall results
         task.add_log("SEARCH_PAPERS", "INFO", f"Search stage completed: {successful_searches} successful, {failed_searches} failed", {
@@ -325,6 +414,67 @@ class TaskProcessor:
             "total_papers": len(task.papers)
         })
 
+    def _search_single_paper(self, task: ProcessingTask, i: int, paper: PaperTask) -> bool:
+        """Look up one paper's details and record the outcome on the task; returns whether it was found"""
+        try:
+            now = task.set_paper_status(i, PaperStatus.SEARCHING)
+            
+            task.add_log("SEARCH_PAPERS", "INFO", f"Starting search for paper {i+1}/{len(task.papers)}: {paper.title[:100]}...", {
+                "paper_index": i,
+                "paper_title": paper.title,
+                "initial_url": paper.url
+            }, ts=now)
+            self._mark_dirty(task)
+            
+            paper_dict = {"title": paper.title, "url": paper.url}
+            if self._recall_bucket:
+                self._recall_bucket.acquire()
+            details = find_paper_details(paper_dict, self.config, self.usage_tracker)
+            now = datetime.now(timezone.utc)
+            
+            if details:
+                task.set_paper_url(i, details.get('pdf_url', paper.url))
+                # Ensure details are JSON serializable; anything orjson can't encode natively becomes str
+                task.set_paper_progress(i, 'search', orjson.loads(orjson.dumps(details, default=str)))
+                task.set_paper_status(i, PaperStatus.SEARCH_COMPLETED, ts=now)  # Search done, ready for analysis
+                
+                task.add_log("SEARCH_PAPERS", "INFO", f"Successfully found details for paper {i+1}: {paper.title[:100]}...", {
+                    "paper_index": i,
+                    "paper_title": paper.title,
+                    "found_url": paper.url,
+                    "arxiv_id": details.get('arxiv_id'),
+                    "authors": details.get('authors', [])[:3] if details.get('authors') else [],
+                    "search_method": details.get('search_method', 'unknown')
+                }, ts=now)
+                logging.info(f"Found details for: {paper.title}")
+            else:
+                task.set_paper_status(i, PaperStatus.FAILED, ts=now)
+                task.set_paper_error(i, "Failed to find paper details")
+                task.add_log("SEARCH_PAPERS", "WARNING", f"Failed to find details for paper {i+1}: {paper.title[:100]}...", {
+                    "paper_index": i,
+                    "paper_title": paper.title,
+                    "error": "No matching paper found in search databases"
+                }, ts=now)
+                logging.warning(f"Failed to find details for: {paper.title}")
+            
+            self._mark_dirty(task)
+            return bool(details)
+            
+        except Exception as e:
+            error_msg = f"Error searching paper {paper.title}: {e}"
+            logging.error(error_msg)
+            now = datetime.now(timezone.utc)
+            task.add_log("SEARCH_PAPERS", "ERROR", f"Search error for paper {i+1}: {paper.title[:100]}...", {
+                "paper_index": i,
+                "paper_title": paper.title,
+                "exception": str(e),
+                "error_type": type(e).__name__
+            }, ts=now)
+            task.set_paper_status(i, PaperStatus.FAILED, ts=now)
+            task.set_paper_error(i, str(e))
+            self._mark_dirty(task)
+            return False
+
     def _analyze_papers(self, task: ProcessingTask):
         task.update_status(TaskStatus.ANALYZING_PAPERS)
         task.add_log("ANALYZE_PAPERS", "INFO", f"Starting paper analysis stage")
@@ -337,8 +487,8 @@ class TaskProcessor:
         
         # Filter papers that are ready for analysis
         papers_to_analyze = [
-            (i, paper) for i, paper in enumerate(task.papers) 
-            if paper.status == PaperStatus.SEARCH_COMPLETED and 'search' in paper.progress
+            (i, task.papers[i]) for i in task.paper_indices(PaperStatus.SEARCH_COMPLETED)
+            if 'search' in task.papers[i].progress
         ]
         
         task.add_log("ANALYZE_PAPERS", "INFO", f"Found {len(papers_to_analyze)} papers ready for analysis out of {len(task.papers)} total", {
@@ -351,98 +501,70 @@ class TaskProcessor:
             task.add_log("ANALYZE_PAPERS", "WARNING", "No papers available for analysis - all papers failed search stage")
             return
         
-        # Process papers sequentially (no concurrency)
         completed_analysis = 0
         failed_analysis = 0
         
         # Load existing cache for checking
-        cache_path = project_root / 'storage' / 'paper_search_agent' / 'cache.json'
-        cache = {}
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-                task.add_log("ANALYZE_PAPERS", "INFO", f"Loaded existing cache with {len(cache)} entries", {
-                    "cache_path": str(cache_path),
-                    "cache_entries": len(cache)
-                })
-            except Exception as e:
-                logging.warning(f"Failed to load existing cache: {e}")
-                task.add_log("ANALYZE_PAPERS", "WARNING", f"Failed to load cache: {e}")
-                cache = {}
+        with self._reading_cache_lock:
+            cache = self._get_reading_cache()
+        if cache:
+            task.add_log("ANALYZE_PAPERS", "INFO", f"Loaded existing cache with {len(cache)} entries", {
+                "cache_path": str(_READING_CACHE_PATH),
+                "cache_entries": len(cache)
+            })
         
+        # Phase 1: resolve cache hits inline (cheap); everything else needs an LLM analysis
+        papers_to_run = []
         for i, paper in papers_to_analyze:
-            try:
-                # Check if analysis already exists in cache
-                cache_key = _normalize_title(paper.title)
-                if cache_key in cache and 'summary_path' in cache[cache_key]:
-                    # Found existing analysis in cache
-                    cached_summary_path = cache[cache_key]['summary_path']
-                    full_summary_path = project_root / cached_summary_path
-                    
-                    if full_summary_path.exists():
-                        # Use cached analysis
-                        paper.progress['analysis'] = {"summary_path": str(cached_summary_path)}
-                        paper.status = PaperStatus.COMPLETED
-                        completed_analysis += 1
-                        
-                        task.add_log("ANALYZE_PAPERS", "INFO", f"Found cached analysis for paper {i+1}: {paper.title[:100]}...", {
-                            "paper_index": i,
-                            "paper_title": paper.title,
-                            "cache_key": cache_key,
-                            "cached_summary_path": cached_summary_path,
-                            "cache_hit": True
-                        })
-                        logging.info(f"Cache hit for analysis: {paper.title}")
-                        paper.updated_at = datetime.now(timezone.utc)
-                        self.task_storage.update_task(task)
-                        continue
-                    else:
-                        # Cache entry exists but file is missing, proceed with analysis
-                        task.add_log("ANALYZE_PAPERS", "WARNING", f"Cache entry exists but file missing for paper {i+1}: {paper.title[:100]}...", {
-                            "paper_index": i,
-                            "paper_title": paper.title,
-                            "cache_key": cache_key,
-                            "missing_file": str(full_summary_path),
-                            "cache_miss": True
-                        })
-
-                # Use the new analysis method with immediate cache update
-                if self._analyze_single_paper_with_retry(task, paper, i, analysis_dir, cache):
-                    completed_analysis += 1
-                else:
-                    failed_analysis += 1
-                
-            except Exception as e:
-                error_msg = f"Error analyzing paper {paper.title}: {e}"
-                logging.error(error_msg)
-                task.add_log("ANALYZE_PAPERS", "ERROR", f"Unexpected error during analysis of paper {i+1}: {paper.title[:100]}...", {
+            cache_key = paper.cache_key
+            cached_summary_path = cache.get(cache_key, {}).get('summary_path')
+            if cached_summary_path is None:
+                papers_to_run.append((i, paper))
+                continue
+            
+            full_summary_path = project_root / cached_summary_path
+            if not full_summary_path.exists():
+                # Cache entry exists but file is missing, proceed with analysis
+                task.add_log("ANALYZE_PAPERS", "WARNING", f"Cache entry exists but file missing for paper {i+1}: {paper.title[:100]}...", {
                     "paper_index": i,
                     "paper_title": paper.title,
-                    "exception": str(e),
-                    "error_type": type(e).__name__
+                    "cache_key": cache_key,
+                    "missing_file": str(full_summary_path),
+                    "cache_miss": True
                 })
-                paper.status = PaperStatus.FAILED
-                paper.error = str(e)
-                paper.updated_at = datetime.now(timezone.utc)
-                failed_analysis += 1
-                self.task_storage.update_task(task)
+                papers_to_run.append((i, paper))
+                continue
+            
+            # Use cached analysis
+            task.set_paper_progress(i, 'analysis', {"summary_path": str(cached_summary_path)})
+            now = task.set_paper_status(i, PaperStatus.COMPLETED)
+            completed_analysis += 1
+            
+            task.add_log("ANALYZE_PAPERS", "INFO", f"Found cached analysis for paper {i+1}: {paper.title[:100]}...", {
+                "paper_index": i,
+                "paper_title": paper.title,
+                "cache_key": cache_key,
+                "cached_summary_path": cached_summary_path,
+                "cache_hit": True
+            }, ts=now)
+            logging.info(f"Cache hit for analysis: {paper.title}")
+            self._mark_dirty(task)
         
-        # Retry failed papers
+        # Phase 2: analyze the misses on a bounded thread pool; each worker handles its own retry
         retry_completed = 0
-        for i, paper in papers_to_analyze:
-            if self._should_retry_paper(paper):
-                task.add_log("ANALYZE_PAPERS", "INFO", f"Starting retry for failed paper {i+1}: {paper.title[:100]}...", {
-                    "paper_index": i,
-                    "paper_title": paper.title,
-                    "retry_attempt": paper.progress.get('retry_count', 0) + 1
-                })
-                
-                if self._analyze_single_paper_with_retry(task, paper, i, analysis_dir, cache):
+        if papers_to_run:
+            concurrency = self.config.get('max_analysis_concurrent', 8)
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(papers_to_run)))) as pool:
+                results = list(pool.map(
+                    lambda item: self._analyze_paper_with_retries(task, *item, analysis_dir, cache), papers_to_run
+                ))
+            for ok, retried in results:
+                if ok:
+                    completed_analysis += 1
+                else:
+                    failed_analysis += 1
+                if ok and retried:
                     retry_completed += 1
-                    if paper.status == PaperStatus.COMPLETED:
-                        completed_analysis += 1
-                        failed_analysis -= 1
         
         # Log retry results
         if retry_completed > 0:
@@ -460,12 +582,53 @@ class TaskProcessor:
             "immediate_cache_updates": "enabled"
         })
 
+    def _analyze_paper_with_retries(self, task: ProcessingTask, i: int, paper: PaperTask,
+                                    analysis_dir: Path, cache: dict) -> Tuple[bool, bool]:
+        """Analyze one paper, retrying once if the failure looks transient; returns (succeeded, retried)"""
+        try:
+            if self._analyze_single_paper_with_retry(task, paper, i, analysis_dir, cache):
+                return True, False
+        except Exception as e:
+            error_msg = f"Error analyzing paper {paper.title}: {e}"
+            logging.error(error_msg)
+            now = datetime.now(timezone.utc)
+            task.add_log("ANALYZE_PAPERS", "ERROR", f"Unexpected error during analysis of paper {i+1}: {paper.title[:100]}...", {
+                "paper_index": i,
+                "paper_title": paper.title,
+                "exception": str(e),
+                "error_type": type(e).__name__
+            }, ts=now)
+            task.set_paper_status(i, PaperStatus.FAILED, ts=now)
+            task.set_paper_error(i, str(e))
+            self._mark_dirty(task)
+        
+        if not self._should_retry_paper(paper):
+            return False, False
+        task.add_log("ANALYZE_PAPERS", "INFO", f"Starting retry for failed paper {i+1}: {paper.title[:100]}...", {
+            "paper_index": i,
+            "paper_title": paper.title,
+            "retry_attempt": paper.progress.get('retry_count', 0) + 1
+        })
+        ok = self._analyze_single_paper_with_retry(task, paper, i, analysis_dir, cache)
+        return ok and paper.status == PaperStatus.COMPLETED, True
+
+    @staticmethod
+    def _status_stamp(task: ProcessingTask) -> Tuple[int, datetime]:
+        # The version covers every model change; updated_at also moves when storage saves the task
+        return task.version, task.updated_at
+
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Status of one task; rebuilt only when the task changed (pollers get the cached dict)"""
         task = self.task_storage.get_task(task_id)
         if not task:
+            self._status_cache.pop(task_id, None)
             return {"error": "Task not found"}
+        stamp = self._status_stamp(task)
+        cached = self._status_cache.get(task_id)
+        if cached and cached[0] == stamp:
+            return cached[1]
         progress = task.get_progress_summary()
-        return {
+        status = {
             "id": task.id,
             "title": task.title,
             "status": task.status,
@@ -484,48 +647,45 @@ class TaskProcessor:
                 for paper in task.papers
             ]
         }
+        self._status_cache[task_id] = (stamp, status)
+        return status
+
+    def _task_summary(self, task: ProcessingTask) -> Tuple[Tuple[int, datetime], Dict[str, Any]]:
+        """(_status_stamp, summary dict) for the task list, reusing the cached entry if still current"""
+        stamp = self._status_stamp(task)
+        cached = self._summary_cache.get(task.id)
+        if cached and cached[0] == stamp:
+            return cached
+        return stamp, {
+            "id": task.id,
+            "title": task.title,
+            "status": task.status,
+            "progress": task.get_progress_summary(),
+            "created_at": task.created_at.isoformat(),
+            "updated_at": task.updated_at.isoformat(),
+            "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+            "error": task.error
+        }
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        tasks = self.task_storage.get_all_tasks()
-        return [
-            {
-                "id": task.id,
-                "title": task.title,
-                "status": task.status,
-                "progress": task.get_progress_summary(),
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat(),
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                "error": task.error
-            }
-            for task in tasks
-        ]
+        """Summaries of all tasks; finished tasks reuse the dict built on an earlier call"""
+        summaries = {task.id: self._task_summary(task) for task in self.task_storage.get_all_tasks()}
+        self._summary_cache = summaries  # Rebuilt each call, so deleted tasks drop out
+        return [summary for _, summary in summaries.values()]
 
     def _update_reading_cache(self, task: ProcessingTask):
         """Update the reading page cache with successfully analyzed papers"""
-        import json
-        
-        # Path to the reading page cache
-        cache_path = project_root / 'storage' / 'paper_search_agent' / 'cache.json'
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Load existing cache
-        cache = {}
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-            except Exception as e:
-                logging.warning(f"Failed to load existing cache: {e}")
-                cache = {}
+        cache_path = _READING_CACHE_PATH
+        cache = self._get_reading_cache()
         
         # Add successfully analyzed papers to cache
         updated_count = 0
         skipped_count = 0
-        for paper in task.papers:
-            if paper.status == PaperStatus.COMPLETED and 'search' in paper.progress and 'analysis' in paper.progress:
-                # Normalize title for cache key (use same logic as original paper_search_agent)
-                cache_key = _normalize_title(paper.title)
+        for i in task.paper_indices(PaperStatus.COMPLETED):
+            paper = task.papers[i]
+            if 'search' in paper.progress and 'analysis' in paper.progress:
+                # Normalized title, same key as the original paper_search_agent uses
+                cache_key = paper.cache_key
                 
                 # Check if paper already exists in cache with summary
                 if cache_key in cache and 'summary_path' in cache[cache_key]:
@@ -546,7 +706,7 @@ class TaskProcessor:
                     "summary_path": paper.progress['analysis']['summary_path']
                 }
                 
-                cache[cache_key] = cache_entry
+                cache[cache_key] = self._reading_cache_pending[cache_key] = cache_entry
                 updated_count += 1
                 
                 task.add_log("CACHE_UPDATE", "INFO", f"Added paper to reading cache: {paper.title[:100]}...", {
@@ -558,8 +718,7 @@ class TaskProcessor:
         if updated_count > 0:
             # Save updated cache
             try:
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache, f, indent=2, ensure_ascii=False)
+                self._save_reading_cache()
                 
                 task.add_log("CACHE_UPDATE", "INFO", f"Successfully updated reading cache with {updated_count} papers ({skipped_count} skipped as duplicates)", {
                     "cache_path": str(cache_path),
@@ -583,27 +742,13 @@ class TaskProcessor:
 
     def _update_single_paper_to_cache(self, task: ProcessingTask, paper: PaperTask) -> bool:
         """Immediately update a single completed paper to the reading cache"""
-        import json
-        
         if paper.status != PaperStatus.COMPLETED or 'search' not in paper.progress or 'analysis' not in paper.progress:
             return False
         
-        # Path to the reading page cache
-        cache_path = project_root / 'storage' / 'paper_search_agent' / 'cache.json'
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Load existing cache
-        cache = {}
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-            except Exception as e:
-                logging.warning(f"Failed to load existing cache for single paper update: {e}")
-                cache = {}
+        cache_path = _READING_CACHE_PATH
+        cache = self._get_reading_cache()
         
-        # Normalize title for cache key
-        cache_key = _normalize_title(paper.title)
+        cache_key = paper.cache_key
         
         # Check if paper already exists in cache
         if cache_key in cache and 'summary_path' in cache[cache_key]:
@@ -623,29 +768,17 @@ class TaskProcessor:
             "summary_path": paper.progress['analysis']['summary_path']
         }
         
-        cache[cache_key] = cache_entry
+        # Written by the background flusher, so papers finishing close together share one write
+        cache[cache_key] = self._reading_cache_pending[cache_key] = cache_entry
+        self._dirty_event.set()
         
-        # Save updated cache immediately
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
-            
-            task.add_log("CACHE_UPDATE", "INFO", f"Immediately added paper to reading cache: {paper.title[:100]}...", {
-                "paper_title": paper.title,
-                "cache_key": cache_key,
-                "summary_path": paper.progress['analysis']['summary_path'],
-                "cache_path": str(cache_path)
-            })
-            return True
-            
-        except Exception as e:
-            task.add_log("CACHE_UPDATE", "ERROR", f"Failed to save cache for paper: {paper.title[:100]}...", {
-                "paper_title": paper.title,
-                "cache_key": cache_key,
-                "error": str(e),
-                "cache_path": str(cache_path)
-            })
-            return False
+        task.add_log("CACHE_UPDATE", "INFO", f"Added paper to reading cache: {paper.title[:100]}...", {
+            "paper_title": paper.title,
+            "cache_key": cache_key,
+            "summary_path": paper.progress['analysis']['summary_path'],
+            "cache_path": str(cache_path)
+        })
+        return True
 
     def _should_retry_paper(self, paper: PaperTask, max_retries: int = 2) -> bool:
         """Check if a paper should be retried based on failure reason and retry count"""
@@ -660,13 +793,8 @@ class TaskProcessor:
             return False
         
         # Check if error is retryable (avoid retrying permanent failures)
-        if paper.error:
-            error_msg = paper.error.lower()
-            # Don't retry if it's a permanent error
-            if any(permanent_error in error_msg for permanent_error in [
-                'not found', 'does not exist', '404', 'invalid url', 'malformed'
-            ]):
-                return False
+        if paper.error and _PERMANENT_ERROR_RE.search(paper.error):
+            return False
         
         return True
     
@@ -674,27 +802,26 @@ class TaskProcessor:
         """Retry analysis for a failed paper"""
         # Increment retry count
         retry_count = paper.progress.get('retry_count', 0) + 1
-        paper.progress['retry_count'] = retry_count
+        task.set_paper_progress(paper_index, 'retry_count', retry_count)
+        now = datetime.now(timezone.utc)
         
         task.add_log("ANALYZE_PAPERS", "INFO", f"Retrying analysis for paper {paper_index+1} (attempt {retry_count}): {paper.title[:100]}...", {
             "paper_index": paper_index,
             "paper_title": paper.title,
             "retry_attempt": retry_count,
             "previous_error": paper.error
-        })
+        }, ts=now)
         
         # Reset status and error for retry
-        paper.status = PaperStatus.ANALYZING
-        paper.error = None
-        paper.updated_at = datetime.now(timezone.utc)
+        task.set_paper_status(paper_index, PaperStatus.ANALYZING, ts=now)
+        task.set_paper_error(paper_index, None)
         
         return self._analyze_single_paper_with_retry(task, paper, paper_index, analysis_dir, cache)
     
     def _analyze_single_paper_with_retry(self, task: ProcessingTask, paper: PaperTask, paper_index: int, analysis_dir: Path, cache: dict) -> bool:
         """Analyze a single paper with immediate cache update and return success status"""
         try:
-            paper.status = PaperStatus.ANALYZING
-            paper.updated_at = datetime.now(timezone.utc)
+            now = task.set_paper_status(paper_index, PaperStatus.ANALYZING)
             
             task.add_log("ANALYZE_PAPERS", "INFO", f"Analyzing paper {paper_index+1}: {paper.title[:100]}...", {
                 "paper_index": paper_index,
@@ -702,26 +829,45 @@ class TaskProcessor:
                 "paper_url": paper.url,
                 "has_search_data": 'search' in paper.progress,
                 "retry_count": paper.progress.get('retry_count', 0)
-            })
-            self.task_storage.update_task(task)
+            }, ts=now)
+            self._mark_dirty(task)
             
             paper_dict = {"title": paper.title, "url": paper.url, **paper.progress.get('search', {})}
+            memo_key = self._analysis_memo_key(paper_dict)
+            
+            memo_summary_path = self._lookup_analysis_memo(memo_key)
+            if memo_summary_path is not None:
+                # Same PDF was summarized by an earlier task, possibly under a differently spelled title
+                task.set_paper_progress(paper_index, 'analysis', {"summary_path": memo_summary_path})
+                now = task.set_paper_status(paper_index, PaperStatus.COMPLETED)
+                
+                task.add_log("ANALYZE_PAPERS", "INFO", f"Reused earlier analysis of the same PDF for paper {paper_index+1}: {paper.title[:100]}...", {
+                    "paper_index": paper_index,
+                    "paper_title": paper.title,
+                    "summary_path": memo_summary_path,
+                    "memo_hit": True
+                }, ts=now)
+                with self._reading_cache_lock:
+                    self._update_single_paper_to_cache(task, paper)
+                self._mark_dirty(task)
+                logging.info(f"Analysis memo hit: {paper.title}")
+                return True
             
             try:
+                if self._analysis_bucket:
+                    self._analysis_bucket.acquire()
                 analysis_results = analyze_paper(paper_dict, self.config, self.usage_tracker)
                 
                 if analysis_results:
                     paper_id = paper_dict.get('arxiv_id', f'paper_{paper_index}')
                     paper_dir = analysis_dir / paper_id
-                    paper_dir.mkdir(parents=True, exist_ok=True)
+                    paper_dir.mkdir(exist_ok=True)  # analysis_dir is created once when the stage starts
                     summary_path = paper_dir / 'summary.md'
+                    summary_path.write_text(analysis_results['summary'], encoding='utf-8')
+                    self._remember_analysis(memo_key, str(summary_path.relative_to(project_root)))
                     
-                    with open(summary_path, 'w', encoding='utf-8') as f:
-                        f.write(analysis_results['summary'])
-                    
-                    paper.progress['analysis'] = {"summary_path": str(summary_path.relative_to(project_root))}
-                    paper.status = PaperStatus.COMPLETED
-                    paper.updated_at = datetime.now(timezone.utc)
+                    task.set_paper_progress(paper_index, 'analysis', {"summary_path": str(summary_path.relative_to(project_root))})
+                    now = task.set_paper_status(paper_index, PaperStatus.COMPLETED)
                     
                     task.add_log("ANALYZE_PAPERS", "INFO", f"Successfully analyzed paper {paper_index+1}: {paper.title[:100]}...", {
                         "paper_index": paper_index,
@@ -730,10 +876,11 @@ class TaskProcessor:
                         "summary_path": str(summary_path.relative_to(project_root)),
                         "summary_length": len(analysis_results['summary']),
                         "retry_count": paper.progress.get('retry_count', 0)
-                    })
+                    }, ts=now)
                     
                     # Immediately update cache after successful analysis
-                    cache_updated = self._update_single_paper_to_cache(task, paper)
+                    with self._reading_cache_lock:  # In-memory cache shared by analysis workers
+                        cache_updated = self._update_single_paper_to_cache(task, paper)
                     if cache_updated:
                         task.add_log("ANALYZE_PAPERS", "INFO", f"Paper {paper_index+1} immediately added to cache", {
                             "paper_index": paper_index,
@@ -741,33 +888,31 @@ class TaskProcessor:
                             "cache_updated": True
                         })
                     
-                    # Update task storage after completing the paper
-                    self.task_storage.update_task(task)
+                    # Schedule a save of the completed paper
+                    self._mark_dirty(task)
                     
                     logging.info(f"Analyzed and cached: {paper.title}")
                     return True
                     
                 else:
-                    paper.status = PaperStatus.FAILED
-                    paper.error = "Analysis function returned empty/null result"
-                    paper.updated_at = datetime.now(timezone.utc)
+                    now = task.set_paper_status(paper_index, PaperStatus.FAILED)
+                    task.set_paper_error(paper_index, "Analysis function returned empty/null result")
                     
                     task.add_log("ANALYZE_PAPERS", "WARNING", f"Analysis returned no results for paper {paper_index+1}: {paper.title[:100]}...", {
                         "paper_index": paper_index,
                         "paper_title": paper.title,
                         "error": "Analysis function returned empty/null result",
                         "retry_count": paper.progress.get('retry_count', 0)
-                    })
+                    }, ts=now)
                     
-                    self.task_storage.update_task(task)
+                    self._mark_dirty(task)
                     logging.warning(f"Failed to analyze: {paper.title}")
                     return False
                     
             except Exception as analysis_error:
                 error_msg = f"Analysis function error for {paper.title}: {analysis_error}"
-                paper.status = PaperStatus.FAILED
-                paper.error = str(analysis_error)
-                paper.updated_at = datetime.now(timezone.utc)
+                now = task.set_paper_status(paper_index, PaperStatus.FAILED)
+                task.set_paper_error(paper_index, str(analysis_error))
                 
                 task.add_log("ANALYZE_PAPERS", "ERROR", f"Analysis function failed for paper {paper_index+1}: {paper.title[:100]}...", {
                     "paper_index": paper_index,
@@ -775,17 +920,16 @@ class TaskProcessor:
                     "exception": str(analysis_error),
                     "error_type": type(analysis_error).__name__,
                     "retry_count": paper.progress.get('retry_count', 0)
-                })
+                }, ts=now)
                 
-                self.task_storage.update_task(task)
+                self._mark_dirty(task)
                 logging.error(error_msg)
                 return False
                 
         except Exception as e:
             error_msg = f"Unexpected error analyzing paper {paper.title}: {e}"
-            paper.status = PaperStatus.FAILED
-            paper.error = str(e)
-            paper.updated_at = datetime.now(timezone.utc)
+            now = task.set_paper_status(paper_index, PaperStatus.FAILED)
+            task.set_paper_error(paper_index, str(e))
             
             task.add_log("ANALYZE_PAPERS", "ERROR", f"Unexpected error during analysis of paper {paper_index+1}: {paper.title[:100]}...", {
                 "paper_index": paper_index,
@@ -793,28 +937,30 @@ class TaskProcessor:
                 "exception": str(e),
                 "error_type": type(e).__name__,
                 "retry_count": paper.progress.get('retry_count', 0)
-            })
+            }, ts=now)
             
-            self.task_storage.update_task(task)
+            self._mark_dirty(task)
             logging.error(error_msg)
             return False
     
     def is_task_processing(self, task_id: str) -> bool:
         """Check if a task is currently being processed"""
         with self._processing_lock:
-            return self._current_processing_task == task_id
+            return task_id in self._active_tasks
     
     def get_processing_stats(self) -> Dict[str, Any]:
         """Get current processing statistics"""
         with self._processing_lock:
             # Get queue status
             pending_task = self._get_next_pending_task()
-            all_tasks = self.task_storage.get_all_tasks()
-            pending_count = len([t for t in all_tasks if t.status == TaskStatus.PENDING])
+            pending_count = len(self.task_storage.get_pending_tasks())
+            active_tasks = sorted(self._active_tasks)
             
             return {
-                "current_processing_task": self._current_processing_task,
-                "processing_mode": "sequential_with_scheduler",
+                "current_processing_task": active_tasks[0] if active_tasks else None,
+                "active_tasks": active_tasks,
+                "max_concurrent_tasks": self._max_active_tasks,
+                "processing_mode": "concurrent_with_scheduler",
                 "scheduler_running": self._scheduler_running,
                 "pending_tasks_count": pending_count,
                 "next_pending_task": pending_task.id if pending_task else None
@@ -1,5 +1,8 @@
 import gradio as gr
-import json
+import functools
+import os
+import sys
+from operator import itemgetter
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
@@ -7,6 +10,9 @@ from datetime import datetime
 # Define project paths, adjusting for the new file location
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CACHE_FILE = PROJECT_ROOT / "storage/paper_search_agent/cache.json"
+sys.path.append(str(PROJECT_ROOT))
+
+from tools.paper.cache import cache_stamp, load_cache
 
 CUSTOM_CSS = """
 /* Create a scrollable container for the summary with a fixed height matching the PDF viewer */
@@ -51,6 +57,11 @@ CUSTOM_CSS = """
 }
 """
 
+@functools.lru_cache(maxsize=128)
+def _read_summary(path_str, mtime_ns):
+    """Reads a summary file; the mtime is part of the cache key, so a rewritten summary is re-read."""
+    return Path(path_str).read_text()
+
 def format_collection_time(collected_at_str):
     """Format collection time for display."""
     if not collected_at_str:
@@ -64,41 +75,69 @@ def format_collection_time(collected_at_str):
     except:
         return "Unknown"
 
+def format_display_title(paper):
+    """The dropdown label for a paper; also the key of the lookup index built by load_data."""
+    formatted_time = format_collection_time(paper.get('collected_at', ''))
+    return f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
+
 def load_data():
-    """Loads, sorts, and prepares the paper data for display. Only includes papers with summaries."""
-    if not CACHE_FILE.exists():
+    """
+    Loads, sorts, and prepares the paper data for display. Only includes papers with summaries.
+
+    Returns the dataframe for display and an index of display_title -> paper for lookups.
+    The result is reused until cache.json or its journal changes or a summary file appears
+    or disappears, so refreshing an untouched cache only costs one stat per summary.
+    """
+    stamp = cache_stamp(CACHE_FILE)
+    if stamp is None:
         return pd.DataFrame(columns=["display_title", "title", "collected_at"]), {}
-    
-    with open(CACHE_FILE, 'r') as f:
-        # The cache is pre-sorted by the agent, so we load it as is.
-        cache_data = json.load(f)
+    summary_paths = _load_summary_candidates(stamp)
+    present = tuple(os.path.exists(path) for _, path in summary_paths)
+    return _load_data_cached(stamp, present)
+
+@functools.lru_cache(maxsize=1)
+def _load_summary_candidates(stamp):
+    """
+    Reads cache.json plus the agent's journal into (paper, absolute summary path) pairs;
+    `stamp` (cache_stamp of both files) is the cache key.
+    """
+    # The cache is pre-sorted by the agent, so we load it as is.
+    cache_data = load_cache(CACHE_FILE)
+    # Only papers that have a summary_path are candidates for display
+    return [
+        (paper, str(PROJECT_ROOT / paper['summary_path']))
+        for paper in cache_data.values() if paper.get('summary_path')
+    ]
 
+@functools.lru_cache(maxsize=1)
+def _load_data_cached(stamp, present):
+    """
+    Builds load_data's result. `present` flags which candidate summary files exist,
+    so it is part of the cache key next to the cache files' stamp.
+    """
     papers = []
-    filtered_cache = {}
-    
-    for key, paper in cache_data.items():
-        # Only include papers that have a summary_path
-        summary_path_str = paper.get('summary_path')
-        if summary_path_str:
-            summary_path = PROJECT_ROOT / summary_path_str
-            # Also check that the summary file actually exists
-            if summary_path.exists():
-                collected_at = paper.get('collected_at', '')
-                formatted_time = format_collection_time(collected_at)
-                
-                display_title = f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
-                papers.append({
-                    "display_title": display_title,
-                    "title": paper.get('title', 'No Title'),
-                    "collected_at": collected_at or "1970-01-01T00:00:00+00:00"  # Default old date for sorting
-                })
-                filtered_cache[key] = paper
+    paper_index = {}
+
+    for (paper, summary_path), exists in zip(_load_summary_candidates(stamp), present):
+        if not exists:
+            continue
+        # Keep the resolved path, so selecting the paper doesn't rebuild it
+        paper['_summary_abs'] = summary_path
+        collected_at = paper.get('collected_at', '')
+        display_title = format_display_title(paper)
+        papers.append({
+            "display_title": display_title,
+            "title": paper.get('title', 'No Title'),
+            "collected_at": collected_at or "1970-01-01T00:00:00+00:00"  # Default old date for sorting
+        })
+        # Same display title: keep the first entry, like PaperService does
+        paper_index.setdefault(display_title, paper)
 
     # Sort by collection time in descending order (newest first)
-    papers.sort(key=lambda x: x["collected_at"], reverse=True)
+    papers.sort(key=itemgetter("collected_at"), reverse=True)
     
     df = pd.DataFrame(papers)
-    return df, filtered_cache # Return df for display, and filtered cache for lookups
+    return df, paper_index
 
 def search_papers(df, keyword):
     """Filters the dataframe based on a keyword."""
@@ -107,25 +146,15 @@ def search_papers(df, keyword):
     # Case-insensitive search in the display title
     return df[df['display_title'].str.contains(keyword, case=False, na=False)]
 
-def get_paper_content(selected_display_title: str, cache_data: dict):
+def get_paper_content(selected_display_title: str, paper_index: dict):
     """
     Given a selected paper's display title, returns its PDF URL and summary markdown.
     """
     if not selected_display_title:
         return "### Select a paper to view its PDF.", "### Select a paper to view its summary."
 
-    # Find the full paper details from the cache using the display title
-    # Need to reconstruct the display title to match
-    paper_details = None
-    for paper in cache_data.values():
-        collected_at = paper.get('collected_at', '')
-        formatted_time = format_collection_time(collected_at)
-        display_title = f"[{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'No Title')} | 📅 {formatted_time}"
-        
-        if display_title == selected_display_title:
-            paper_details = paper
-            break
-            
+    # Find the full paper details using the display_title index built by load_data
+    paper_details = paper_index.get(selected_display_title)
     if not paper_details:
         return "### Paper details not found.", "### Paper details not found."
 
@@ -133,28 +162,27 @@ def get_paper_content(selected_display_title: str, cache_data: dict):
     pdf_url = paper_details.get('pdf_url')
     pdf_viewer_html = f'<iframe src="{pdf_url}" width="100%" height="800px" style="border:none;"></iframe>' if pdf_url else "### No PDF URL available."
 
-    # Get summary content from the relative path
+    # Get summary content from the path resolved by load_data
     summary_content = "### No summary available for this paper."
-    summary_path_str = paper_details.get('summary_path')
-    if summary_path_str:
-        summary_path = PROJECT_ROOT / summary_path_str
-        if summary_path.exists():
-            summary_content = summary_path.read_text()
-        else:
-            summary_content = f"### Summary file not found at:\n`{summary_path_str}`"
+    summary_path = paper_details.get('_summary_abs')
+    if summary_path:
+        try:
+            summary_content = _read_summary(summary_path, os.stat(summary_path).st_mtime_ns)
+        except FileNotFoundError:
+            summary_content = f"### Summary file not found at:\n`{paper_details['summary_path']}`"
 
     return pdf_viewer_html, summary_content
 
 def refresh_data():
     """Reloads the paper data and returns updated components."""
-    df, cache_data = load_data()
+    df, paper_index = load_data()
     choices = df["display_title"].tolist()
     paper_count = len(choices)
     
     # Return the new choices and updated info message
     return (
         gr.Dropdown(choices=choices, value=None),  # Updated dropdown
-        cache_data,  # Updated cache state
+        paper_index,  # Updated lookup index state
         f"🔄 Refreshed! Found {paper_count} papers with summaries (sorted by collection time).",  # Status message
         "### Select a paper from the search bar above.",  # Reset PDF viewer
         "### Select a paper from the search bar above."   # Reset summary viewer
@@ -242,8 +270,8 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Paper Research Interface", css=CUS
     """)
 
     # Store data in the app state for performance
-    initial_df, full_cache = load_data()
-    state_cache = gr.State(full_cache)
+    initial_df, paper_index = load_data()
+    state_index = gr.State(paper_index)
 
     gr.Markdown("# Paper Research Interface")
     gr.Markdown("Search for papers collected by the agent. Only papers with AI-generated summaries are shown. Papers are sorted by collection time (newest first).")
@@ -278,7 +306,7 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Paper Research Interface", css=CUS
     # Event handler for when a paper is selected from the dropdown
     search_dropdown.change(
         fn=get_paper_content,
-        inputs=[search_dropdown, state_cache],
+        inputs=[search_dropdown, state_index],
         outputs=[pdf_viewer, summary_viewer],
         queue=True
     )
@@ -287,7 +315,7 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Paper Research Interface", css=CUS
     refresh_button.click(
         fn=refresh_data,
         inputs=[],
-        outputs=[search_dropdown, state_cache, refresh_status, pdf_viewer, summary_viewer],
+        outputs=[search_dropdown, state_index, refresh_status, pdf_viewer, summary_viewer],
         queue=True
     )
 
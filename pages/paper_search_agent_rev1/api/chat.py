@@ -3,8 +3,10 @@
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
+import asyncio
 import sys
+import time
 from pathlib import Path
 
 # 添加项目根目录到Python路径
@@ -19,6 +21,24 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 # 创建服务实例
 chat_service = ChatService()
 
+# 论文详情缓存：paper_id -> (过期时间, 论文详情)，同一对话中的重复查询不再读取cache.json
+_PAPER_CACHE_TTL = 60.0
+_paper_cache: Dict[str, Tuple[float, Any]] = {}
+
+async def _get_paper(paper_id: str):
+    """获取论文详情（带TTL缓存）；读取放到线程中执行，不阻塞事件循环"""
+    now = time.monotonic()
+    cached = _paper_cache.get(paper_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    paper_detail = await asyncio.to_thread(chat_service.paper_service.get_paper_by_id, paper_id)
+    if paper_detail:
+        # 顺带清理过期条目，避免缓存无限增长
+        for key in [key for key, (expires, _) in _paper_cache.items() if expires <= now]:
+            del _paper_cache[key]
+        _paper_cache[paper_id] = (now + _PAPER_CACHE_TTL, paper_detail)
+    return paper_detail
+
 @router.post("/start")
 async def start_chat(request: ChatStartRequest):
     """
@@ -56,7 +76,7 @@ async def get_suggested_questions(paper_id: str):
     """
     try:
         # 先验证论文是否存在
-        paper_detail = chat_service.paper_service.get_paper_by_id(paper_id)
+        paper_detail = await _get_paper(paper_id)
         if not paper_detail:
             raise HTTPException(status_code=404, detail="Paper not found")
         
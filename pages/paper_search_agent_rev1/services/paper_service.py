@@ -2,7 +2,6 @@
 论文服务层 - 复用现有的论文处理逻辑
 """
 
-import json
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timezone
@@ -14,6 +13,7 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(project_root))
 
 from api.models import PaperSummary, PaperDetail, PapersListResponse
+from tools.paper.cache import load_cache
 
 class PaperService:
     def __init__(self):
@@ -31,11 +31,8 @@ class PaperService:
             return "Unknown"
 
     def load_cache(self) -> Dict:
-        """加载缓存文件"""
-        if self.cache_path.exists():
-            with open(self.cache_path, 'r') as f:
-                return json.load(f)
-        return {}
+        """加载缓存文件（快照 + 代理运行期间的追加日志）"""
+        return load_cache(self.cache_path)
 
     def load_papers_data(self) -> PapersListResponse:
         """加载论文数据，返回格式化的列表"""
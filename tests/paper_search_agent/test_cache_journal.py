@@ -0,0 +1,130 @@
+"""
+Unit tests for the agent's cache snapshot and append-only journal.
+They only touch a temporary directory; no API calls are made.
+"""
+
+import sys
+from pathlib import Path
+
+import orjson
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from agents.paper_search_agent import (
+    CacheWriter, append_cache_entry, cache_journal_path, compact_cache_if_needed, load_cache, save_cache
+)
+from tools.paper.cache import cache_stamp
+
+
+def _paper(title: str) -> dict:
+    return {"title": title, "collected_at": "2024-01-01T00:00:00+00:00"}
+
+
+def test_journal_is_replayed_over_the_snapshot(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    save_cache(cache_path, {"a": _paper("A"), "b": _paper("B")})
+    cache = load_cache(cache_path)
+    with open(cache_journal_path(cache_path), "ab") as journal:
+        append_cache_entry(journal, cache, "b", _paper("B v2"))
+        append_cache_entry(journal, cache, "c", _paper("C"))
+
+    # The snapshot is untouched; the journal carries the updates
+    assert list(orjson.loads(cache_path.read_bytes())) == ["a", "b"]
+    reloaded = load_cache(cache_path)
+    assert reloaded == cache
+    assert reloaded["b"]["title"] == "B v2"
+
+
+def test_journal_without_snapshot(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache = {}
+    with open(cache_journal_path(cache_path), "ab") as journal:
+        append_cache_entry(journal, cache, "a", _paper("A"))
+    assert load_cache(cache_path) == {"a": _paper("A")}
+
+
+def test_torn_journal_line_is_ignored_and_compacted_away(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    save_cache(cache_path, {"a": _paper("A")})
+    cache = load_cache(cache_path)
+    journal_path = cache_journal_path(cache_path)
+    with open(journal_path, "ab") as journal:
+        append_cache_entry(journal, cache, "b", _paper("B"))
+        journal.write(b'{"k": "c", "v": {"tit')  # Interrupted append
+
+    cache = load_cache(cache_path)
+    assert set(cache) == {"a", "b"}
+
+    compact_cache_if_needed(cache_path, cache)
+    assert not journal_path.exists()
+    assert orjson.loads(cache_path.read_bytes()) == cache
+
+
+def test_journal_is_compacted_once_it_outgrows_the_snapshot(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    save_cache(cache_path, {"a": _paper("A")})
+    cache = load_cache(cache_path)
+    journal_path = cache_journal_path(cache_path)
+
+    with open(journal_path, "ab") as journal:
+        append_cache_entry(journal, cache, "b", _paper("B"))
+    compact_cache_if_needed(cache_path, cache)
+    assert journal_path.exists()  # Still small next to the snapshot
+
+    with open(journal_path, "ab") as journal:
+        for i in range(10):
+            append_cache_entry(journal, cache, f"p{i}", _paper(f"Paper {i}"))
+    compact_cache_if_needed(cache_path, cache)
+    assert not journal_path.exists()
+    assert orjson.loads(cache_path.read_bytes()) == cache
+    assert load_cache(cache_path) == cache
+
+
+def test_cache_writer_coalesces_snapshot_writes(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    save_cache(cache_path, {})
+    snapshot_mtime = cache_path.stat().st_mtime_ns
+    writer = CacheWriter(cache_path, load_cache(cache_path))
+
+    for i in range(CacheWriter.FLUSH_EVERY - 1):
+        writer.put(f"p{i}", _paper(f"Paper {i}"))
+    # Journaled, so a crash now loses nothing, but the snapshot is not rewritten yet
+    assert cache_path.stat().st_mtime_ns == snapshot_mtime
+    assert len(load_cache(cache_path)) == CacheWriter.FLUSH_EVERY - 1
+
+    writer.put("last", _paper("Last"))
+    assert len(orjson.loads(cache_path.read_bytes())) == CacheWriter.FLUSH_EVERY
+    assert cache_journal_path(cache_path).stat().st_size == 0  # Folded in, reopened for the next puts
+
+    writer.put("after", _paper("After"))
+    writer.close()
+    assert not cache_journal_path(cache_path).exists()
+    assert orjson.loads(cache_path.read_bytes()) == writer.cache
+
+
+def test_cache_writer_close_without_changes_keeps_snapshot(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    save_cache(cache_path, {"a": _paper("A")})
+    snapshot_mtime = cache_path.stat().st_mtime_ns
+
+    CacheWriter(cache_path, load_cache(cache_path)).close()
+
+    assert cache_path.stat().st_mtime_ns == snapshot_mtime
+    assert load_cache(cache_path) == {"a": _paper("A")}
+
+
+def test_cache_stamp_tracks_the_journal(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    assert cache_stamp(cache_path) is None
+    save_cache(cache_path, {"a": _paper("A")})
+    stamp = cache_stamp(cache_path)
+
+    cache = load_cache(cache_path)
+    with open(cache_journal_path(cache_path), "ab") as journal:
+        append_cache_entry(journal, cache, "b", _paper("B"))
+
+    # Readers keyed on the stamp see the journaled entry without a new snapshot
+    assert cache_stamp(cache_path) != stamp
+    assert set(load_cache(cache_path)) == {"a", "b"}
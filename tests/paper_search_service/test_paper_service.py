@@ -0,0 +1,35 @@
+"""
+Unit tests for PaperService reading the agent's cache (snapshot + journal).
+"""
+
+import sys
+from pathlib import Path
+
+import orjson
+
+# Add project root and the service package to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / "agents" / "paper_search_service"))
+
+from services.paper_service import PaperService
+from tools.paper.cache import cache_journal_path
+
+
+def _paper(title: str, arxiv_id: str) -> dict:
+    return {"title": title, "arxiv_id": arxiv_id, "summary_path": f"summaries/{arxiv_id}.md",
+            "collected_at": "2024-01-01T00:00:00+00:00"}
+
+
+def test_journaled_papers_are_visible_before_the_next_snapshot(tmp_path):
+    service = PaperService()
+    service.cache_path = tmp_path / "cache.json"
+    service.cache_path.write_bytes(orjson.dumps({"a": _paper("A", "2401.00001")}))
+    assert [p.title for p in service.load_papers_data().papers] == ["A"]
+
+    # The agent journals a finished paper; cache.json is untouched until its next snapshot
+    with open(cache_journal_path(service.cache_path), "ab") as journal:
+        journal.write(orjson.dumps({"k": "b", "v": _paper("B", "2401.00002")}) + b"\n")
+
+    assert sorted(p.title for p in service.load_papers_data().papers) == ["A", "B"]
+    assert service.get_paper_by_id("2401.00002").title == "B"
@@ -0,0 +1,135 @@
+"""
+Unit tests for TaskProcessor's persistence and scheduling plumbing.
+Task processing itself is replaced by a stub, so no LLM or network calls are made.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root and the service package to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / "agents" / "paper_search_service"))
+
+from models.task import PaperTask, PaperStatus
+from services import task_service
+from services.task_service import TaskProcessor
+
+
+class StubProcessor(TaskProcessor):
+    """A TaskProcessor with a fixed config whose tasks only run `run_stub`"""
+    config_overrides = {}
+
+    def _load_config(self):
+        return dict(self.config_overrides)
+
+    def _run_task(self, task_id: str) -> bool:
+        return self.run_stub(task_id)
+
+    def run_stub(self, task_id: str) -> bool:
+        return True
+
+
+class UnscheduledProcessor(StubProcessor):
+    """A StubProcessor whose scheduler never starts, so only the flusher touches tasks"""
+    def start_scheduler(self):
+        pass
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_paper_updates_are_coalesced_into_one_save(tmp_path):
+    processor = UnscheduledProcessor(tmp_path)
+    storage = processor.task_storage
+    task = storage.create_task("demo", "input text")
+    task.set_papers([PaperTask(title=f"Paper {i}") for i in range(5)])
+    task.update_status(task_service.TaskStatus.ANALYZING_PAPERS)
+    storage.update_task(task)
+
+    saves = []
+    save_task = storage._save_task
+    storage._save_task = lambda t: (saves.append(t.id), save_task(t))
+    for i in range(5):
+        task.set_paper_status(i, PaperStatus.COMPLETED)
+        processor._mark_dirty(task)
+
+    assert saves == []  # Nothing is written until the flush interval has passed
+    assert _wait_for(lambda: saves)
+    time.sleep(task_service._FLUSH_INTERVAL * 2)
+    assert saves == [task.id]
+    reloaded = type(storage)(tmp_path).get_task(task.id)
+    assert reloaded.count_papers(PaperStatus.COMPLETED) == 5
+    processor.stop_scheduler()
+
+
+def test_stop_scheduler_flushes_pending_updates(tmp_path):
+    processor = UnscheduledProcessor(tmp_path)
+    storage = processor.task_storage
+    task = storage.create_task("demo", "input text")
+    task.set_papers([PaperTask(title="Paper")])
+    task.update_status(task_service.TaskStatus.ANALYZING_PAPERS)
+    storage.update_task(task)
+
+    task.set_paper_error(0, "Failed to find paper details")
+    processor._mark_dirty(task)
+    processor.stop_scheduler()
+
+    assert type(storage)(tmp_path).get_task(task.id).papers[0].error == "Failed to find paper details"
+
+
+class GatedProcessor(StubProcessor):
+    """Tasks block until released, recording how many run at once"""
+    config_overrides = {"max_concurrent_tasks": 2}
+
+    def __init__(self, storage_dir: Path):
+        self.release = threading.Event()
+        self.started = []
+        self.peak = 0
+        self._running = 0
+        self._stats_lock = threading.Lock()
+        super().__init__(storage_dir)
+
+    def run_stub(self, task_id: str) -> bool:
+        with self._stats_lock:
+            self.started.append(task_id)
+            self._running += 1
+            self.peak = max(self.peak, self._running)
+        self.release.wait(timeout=5.0)
+        task = self.task_storage.get_task(task_id)
+        task.update_status(task_service.TaskStatus.COMPLETED)
+        self.task_storage.update_task(task)
+        with self._stats_lock:
+            self._running -= 1
+        return True
+
+
+def test_scheduler_runs_up_to_max_concurrent_tasks(tmp_path):
+    processor = GatedProcessor(tmp_path)
+    storage = processor.task_storage
+    tasks = [storage.create_task(f"task {i}", "input") for i in range(3)]
+    processor.notify_new_task()
+
+    # Two slots: the two oldest tasks start, the third waits
+    assert _wait_for(lambda: len(processor.started) == 2)
+    time.sleep(0.1)
+    assert processor.started == [tasks[0].id, tasks[1].id]
+    assert processor.get_processing_stats()["active_tasks"] == sorted([tasks[0].id, tasks[1].id])
+    assert processor.process_task(tasks[2].id) is False  # No free slot for a manual run either
+
+    # A freed slot wakes the scheduler, which starts the queued task
+    processor.release.set()
+    assert _wait_for(lambda: len(processor.started) == 3)
+    assert processor.started[2] == tasks[2].id
+    assert _wait_for(lambda: not processor.get_processing_stats()["active_tasks"])
+    assert processor.peak == 2
+    assert storage.get_pending_tasks() == []
+    processor.stop_scheduler()
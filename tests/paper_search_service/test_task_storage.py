@@ -0,0 +1,180 @@
+"""
+Unit tests for the paper search service's task persistence (models/task.py).
+They run against a temporary storage directory and make no network calls.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root and the service package to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / "agents" / "paper_search_service"))
+
+from models.task import TaskStorage, PaperTask, PaperStatus, ProcessingTask, TaskStatus
+
+
+def _task_mtime(storage: TaskStorage, task_id: str) -> int:
+    return os.stat(storage._task_path(task_id)).st_mtime_ns
+
+
+def _make_task_with_paper(storage: TaskStorage):
+    task = storage.create_task("demo", "input text")
+    task.set_papers([PaperTask(title="Attention Is All You Need")])
+    storage.update_task(task)
+    return task
+
+
+def test_update_task_skips_unchanged_task(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = _make_task_with_paper(storage)
+    saved_updated_at = task.updated_at
+    mtime = _task_mtime(storage, task.id)
+
+    storage.update_task(task)
+
+    assert _task_mtime(storage, task.id) == mtime
+    assert task.updated_at == saved_updated_at
+
+
+def test_update_task_saves_every_kind_of_paper_change(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = _make_task_with_paper(storage)
+
+    task.set_paper_status(0, PaperStatus.FAILED)
+    storage.update_task(task)
+    # A field change right after a save must not be mistaken for "already saved"
+    task.set_paper_error(0, "Failed to find paper details")
+    storage.update_task(task)
+    task.set_paper_url(0, "https://arxiv.org/pdf/1706.03762.pdf")
+    task.set_paper_progress(0, "retry_count", 1)
+    storage.update_task(task)
+
+    paper = TaskStorage(tmp_path).get_task(task.id).papers[0]
+    assert paper.status == PaperStatus.FAILED
+    assert paper.error == "Failed to find paper details"
+    assert paper.url == "https://arxiv.org/pdf/1706.03762.pdf"
+    assert paper.progress == {"retry_count": 1}
+
+
+def test_reloaded_task_is_not_rewritten(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = _make_task_with_paper(storage)
+    mtime = _task_mtime(storage, task.id)
+
+    reloaded = TaskStorage(tmp_path)
+    reloaded.update_task(reloaded.get_task(task.id))
+
+    assert _task_mtime(storage, task.id) == mtime
+
+
+def test_tasks_round_trip_through_per_task_files(tmp_path):
+    storage = TaskStorage(tmp_path)
+    first = _make_task_with_paper(storage)
+    second = storage.create_task("second", "more input", description="desc")
+    second.update_status(TaskStatus.COMPLETED)
+    storage.update_task(second)
+
+    assert sorted(p.name for p in (tmp_path / "tasks").glob("*.json")) == sorted(
+        [f"{first.id}.json", f"{second.id}.json"]
+    )
+    reloaded = TaskStorage(tmp_path)
+    assert [task.id for task in reloaded.get_all_tasks()] == [first.id, second.id]
+    assert reloaded.get_task(first.id).papers[0].title == "Attention Is All You Need"
+    assert reloaded.get_task(second.id).status == TaskStatus.COMPLETED
+    assert reloaded.get_task(second.id).description == "desc"
+
+
+def test_delete_task_removes_its_files(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = _make_task_with_paper(storage)
+    task.add_log("init", "INFO", "created")
+    storage.update_task(task)
+
+    assert storage.delete_task(task.id)
+    assert list((tmp_path / "tasks").iterdir()) == []
+    assert TaskStorage(tmp_path).get_all_tasks() == []
+
+
+def test_legacy_tasks_file_is_migrated(tmp_path):
+    legacy = ProcessingTask(id="legacy-1", title="old", input_text="old input")
+    legacy.set_papers([PaperTask(title="Old Paper")])
+    legacy.add_log("init", "INFO", "from the single-file store")
+    (tmp_path / "tasks.json").write_text(json.dumps({legacy.id: legacy.model_dump(mode="json")}))
+
+    storage = TaskStorage(tmp_path)
+
+    assert not (tmp_path / "tasks.json").exists()
+    assert (tmp_path / "tasks.json.migrated").exists()
+    assert (tmp_path / "tasks" / "legacy-1.json").exists()
+    task = storage.get_task("legacy-1")
+    assert task.papers[0].title == "Old Paper"
+    assert [log.message for log in task.logs] == ["from the single-file store"]
+    # The migrated task survives another restart without the legacy file
+    reloaded = TaskStorage(tmp_path).get_task("legacy-1")
+    assert [log.message for log in reloaded.logs] == ["from the single-file store"]
+
+
+def test_logs_are_appended_to_the_journal(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = storage.create_task("demo", "input text")
+    task.add_log("init", "INFO", "first")
+    storage.update_task(task)
+    task.add_log("search", "ERROR", "second", data={"paper": "x"})
+    storage.update_task(task)
+
+    journal = (tmp_path / "tasks" / f"{task.id}.logs.jsonl").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in journal] == ["first", "second"]
+    assert "logs" not in json.loads((tmp_path / "tasks" / f"{task.id}.json").read_text())
+
+    reloaded = TaskStorage(tmp_path).get_task(task.id)
+    assert [log.message for log in reloaded.logs] == ["first", "second"]
+    assert reloaded.logs[1].data == {"paper": "x"}
+    assert reloaded.has_error_log("search")
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    storage = TaskStorage(tmp_path)
+    task = storage.create_task("demo", "input text")
+    task.add_log("init", "INFO", "first")
+    task.add_log("init", "INFO", "second")
+    storage.update_task(task)
+    # Simulate a crash in the middle of an append
+    with open(tmp_path / "tasks" / f"{task.id}.logs.jsonl", "ab") as f:
+        f.write(b'{"timestamp": "2024-01-01T00:00:00Z", "stage": "se')
+
+    reloaded_storage = TaskStorage(tmp_path)
+    reloaded = reloaded_storage.get_task(task.id)
+    assert [log.message for log in reloaded.logs] == ["first", "second"]
+
+    # Logs added after the restart are appended and read back
+    reloaded.add_log("search", "INFO", "third")
+    reloaded_storage.update_task(reloaded)
+    assert [log.message for log in TaskStorage(tmp_path).get_task(task.id).logs] == ["first", "second", "third"]
+
+
+def test_pending_index_follows_status_changes(tmp_path):
+    storage = TaskStorage(tmp_path)
+    first = storage.create_task("first", "a")
+    second = storage.create_task("second", "b")
+    third = storage.create_task("third", "c")
+    assert [task.id for task in storage.get_pending_tasks()] == [first.id, second.id, third.id]
+
+    second.update_status(TaskStatus.FORMATTING_INPUT)
+    storage.update_task(second)
+    storage.delete_task(third.id)
+    assert [task.id for task in storage.get_pending_tasks()] == [first.id]
+
+    # A status change not yet saved is still honoured
+    first.update_status(TaskStatus.COMPLETED)
+    assert storage.get_pending_tasks() == []
+
+    # Requeued tasks go to the back of the queue; on load the index is rebuilt in creation order
+    fourth = storage.create_task("fourth", "d")
+    second.update_status(TaskStatus.PENDING)
+    storage.update_task(second)
+    storage.update_task(first)
+    assert [task.id for task in storage.get_pending_tasks()] == [fourth.id, second.id]
+    assert [task.id for task in TaskStorage(tmp_path).get_pending_tasks()] == [second.id, fourth.id]
@@ -0,0 +1,69 @@
+"""
+Unit tests for tools/api/ratelimit.py.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from tools.api.ratelimit import TokenBucket, bucket_from_config
+
+
+def _time_acquires(bucket: TokenBucket, count: int) -> float:
+    start = time.monotonic()
+    for _ in range(count):
+        bucket.acquire()
+    return time.monotonic() - start
+
+
+def test_burst_up_to_capacity_does_not_wait():
+    assert _time_acquires(TokenBucket(rate=1, capacity=5), 5) < 0.1
+
+
+def test_calls_beyond_capacity_are_paced_to_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    elapsed = _time_acquires(bucket, 6)
+    # Two tokens are free, the other four arrive at 20 per second
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_idle_time_refills_the_bucket():
+    bucket = TokenBucket(rate=20, capacity=2)
+    _time_acquires(bucket, 2)
+    time.sleep(0.1)
+    assert _time_acquires(bucket, 2) < 0.05
+
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    threads = [threading.Thread(target=_time_acquires, args=(bucket, 2)) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Eight calls, one free token: seven wait their turn
+    assert 0.33 <= time.monotonic() - start < 0.7
+
+
+def test_bucket_from_config():
+    assert bucket_from_config({}, "recall_requests_per_second") is None
+    assert bucket_from_config({"recall_requests_per_second": 0}, "recall_requests_per_second") is None
+    bucket = bucket_from_config({"analysis_requests_per_minute": 30}, "analysis_requests_per_minute", per=60.0)
+    assert bucket.rate == pytest.approx(0.5)
+    assert bucket.capacity == 1.0
+    # A default applies only when the key is unset; 0 still disables pacing
+    assert bucket_from_config({}, "arxiv_requests_per_minute", per=60.0, default=20).rate == pytest.approx(1 / 3)
+    assert bucket_from_config({"arxiv_requests_per_minute": 0}, "arxiv_requests_per_minute", default=20) is None
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
@@ -0,0 +1,57 @@
+"""
+Unit tests for tools/api/retry.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from tools.api.retry import is_transient_error, retry_transient
+
+
+def _http_error(status: int, headers: dict = None) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+def test_transient_errors():
+    assert is_transient_error(requests.exceptions.ConnectionError())
+    assert is_transient_error(requests.exceptions.Timeout())
+    assert is_transient_error(_http_error(429))
+    assert is_transient_error(_http_error(503))
+    assert not is_transient_error(_http_error(404))
+    assert not is_transient_error(ValueError())
+
+
+def test_transient_failures_are_retried():
+    failures = [requests.exceptions.ConnectionError(), _http_error(429, {"Retry-After": "0"})]
+
+    @retry_transient
+    def flaky():
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    assert flaky() == "ok"
+    assert failures == []
+
+
+def test_permanent_failures_are_raised_at_once():
+    calls = []
+
+    @retry_transient
+    def not_found():
+        calls.append(1)
+        raise _http_error(404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        not_found()
+    assert len(calls) == 1
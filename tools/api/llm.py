@@ -1,16 +1,56 @@
 import requests
 import json
 import logging
+from tools.api.session import get_http_session
+from tools.api.retry import retry_transient
 
-def call_llm(llm_config: dict, messages: list, is_json: bool = False, plugins: list = None):
+# (connect, read) seconds; long generations can take minutes. Overridable per LLM via `timeout`.
+_DEFAULT_TIMEOUT = (10, 300)
+
+@retry_transient
+def _post_chat_completion(url: str, headers: dict, payload: dict, stream: bool = False, timeout=_DEFAULT_TIMEOUT) -> requests.Response:
+    """Posts a chat completion request, retrying rate limits and transient failures."""
+    response = get_http_session().post(url, headers=headers, json=payload, stream=stream, timeout=timeout)
+    response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+    return response
+
+def _read_streamed_completion(response: requests.Response):
+    """
+    Accumulates a server-sent-events chat completion stream.
+
+    Returns the same (message, usage) pair as a non-streamed call.
+    """
+    parts = []
+    role = "assistant"
+    usage = {}
+    for line in response.iter_lines():
+        if not line.startswith(b"data:"):
+            continue  # Blank keep-alive lines and SSE comments
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        chunk = json.loads(data)
+        if chunk.get('usage'):
+            usage = chunk['usage']
+        for choice in chunk.get('choices') or ():
+            delta = choice.get('delta') or {}
+            role = delta.get('role') or role
+            if delta.get('content'):
+                parts.append(delta['content'])
+    return {"role": role, "content": "".join(parts)}, usage
+
+def call_llm(llm_config: dict, messages: list, is_json: bool = False, plugins: list = None, stream: bool = False):
     """
     Calls the LLM API with the given configuration and messages.
 
     Args:
         llm_config (dict): A dictionary containing 'base_url', 'api_key', and 'model'.
+            An optional 'timeout' (seconds) overrides the default request timeout.
         messages (list): A list of message objects for the chat completions API.
         is_json (bool): Whether to expect a JSON response from the model.
         plugins (list, optional): A list of plugins to use, e.g., for file parsing.
+        stream (bool): Whether to stream the completion. The streamed deltas are
+            accumulated, so the return value has the same shape either way.
 
     Returns:
         A tuple containing:
@@ -39,9 +79,21 @@ def call_llm(llm_config: dict, messages: list, is_json: bool = False, plugins: l
     if plugins:
         payload["plugins"] = plugins
 
+    if stream:
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+        timeout = llm_config.get('timeout') or _DEFAULT_TIMEOUT
+        response = _post_chat_completion(url, headers, payload, stream=stream, timeout=timeout)
+
+        if stream:
+            with response:
+                try:
+                    return _read_streamed_completion(response)
+                except json.JSONDecodeError as e:
+                    logging.error(f"Failed to decode streamed chunk from LLM API. Error: {e}")
+                    return None, None
         
         # Handle JSON decoding separately to log the problematic response text
         try:
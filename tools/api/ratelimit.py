@@ -0,0 +1,44 @@
+import threading
+import time
+from typing import Optional
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces calls to `rate` per second, allowing
+    bursts of up to `capacity` calls.
+
+    Unlike a fixed sleep after every call, a caller only waits when the bucket
+    is empty, so a healthy upstream is never padded with dead time.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, blocking until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token up front; a negative balance is the queue of waiting callers.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+def bucket_from_config(config: dict, key: str, per: float = 1.0,
+                       default: Optional[float] = None) -> Optional[TokenBucket]:
+    """
+    Builds a bucket from a `requests per <per> seconds` config value, or returns
+    None (no pacing) when the value is not positive. `default` applies when the
+    key is unset.
+    """
+    limit = config.get(key, default)
+    if not limit or limit <= 0:
+        return None
+    return TokenBucket(rate=limit / per)
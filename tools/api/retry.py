@@ -0,0 +1,37 @@
+import requests
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Status codes worth retrying: rate limiting and transient upstream failures.
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_backoff = wait_exponential_jitter(multiplier=0.2, max=8)
+# Cap on a server-requested Retry-After, so one bad header cannot stall a worker.
+_MAX_RETRY_AFTER = 60
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether a failed request is worth retrying."""
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code in _RETRYABLE_STATUS_CODES
+    return False
+
+def wait_retry_after_or_backoff(retry_state) -> float:
+    """Honors the server's Retry-After header when present, otherwise backs off exponentially."""
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    if response is not None:
+        retry_after = response.headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(float(retry_after), _MAX_RETRY_AFTER)
+            except ValueError:
+                pass  # An HTTP-date; fall back to our own backoff.
+    return _backoff(retry_state)
+
+# Decorator for functions that send one HTTP request and call raise_for_status():
+# rate limits and transient failures are retried, anything else is raised at once.
+retry_transient = retry(
+    retry=retry_if_exception(is_transient_error),
+    stop=stop_after_attempt(5),
+    wait=wait_retry_after_or_backoff,
+    reraise=True
+)
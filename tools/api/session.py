@@ -0,0 +1,28 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Sized for the agent's concurrent recall/analysis fan-out.
+_POOL_CONNECTIONS = 10
+_POOL_MAXSIZE = 50
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide requests session used for outbound HTTP calls.
+
+    Reusing one session keeps connections to the LLM, arXiv and OpenAlex hosts
+    alive between calls, so each request skips the TCP + TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
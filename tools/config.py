@@ -0,0 +1,33 @@
+"""
+Shared, cached loader for config/config.yaml.
+"""
+
+import copy
+import functools
+from pathlib import Path
+
+import yaml
+
+try:
+    # libyaml-backed parser; many times faster than the pure-Python SafeLoader.
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / 'config' / 'config.yaml'
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int) -> dict:
+    """Parses a YAML file; the mtime is part of the cache key, so edits invalidate the entry."""
+    # Binary stream: the loader detects the encoding and decodes UTF-8 itself.
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    """
+    Returns the parsed configuration, re-parsing the file only when it changes on disk.
+
+    Each call gets its own deep copy, so callers may mutate it without affecting others.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    return copy.deepcopy(_load_yaml_cached(str(path), path.stat().st_mtime_ns))
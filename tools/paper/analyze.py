@@ -11,7 +11,8 @@ project_root = Path(__file__).resolve().parents[2] # Adjust path for new locatio
 sys.path.append(str(project_root))
 
 from tools.api.llm import call_llm
-from tools.paper.utils import _normalize_title
+from tools.api.session import get_http_session
+from tools.paper.utils import _normalize_title, _load_prompt
 from tools.trackers import update_usage
 import json
 
@@ -19,7 +20,7 @@ import json
 def _get_pdf_content_as_base64(pdf_url: str) -> str | None:
     """Downloads a PDF and returns its content as a base64 encoded string."""
     try:
-        response = requests.get(pdf_url, timeout=30)
+        response = get_http_session().get(pdf_url, timeout=30)
         response.raise_for_status()
         
         # Check file size (limit to 10MB)
@@ -80,7 +81,7 @@ def analyze_paper(paper_info: dict, config: dict, usage_tracker: dict) -> dict |
     summary_step_name = '3_2_paper_summary'
     summary_llm_name = config['agents']['paper_search_agent'][summary_step_name]
     summary_llm_config = config['llms'][summary_llm_name]
-    summary_prompt = (project_root / 'prompts' / 'paper_search_agent' / f'{summary_step_name}.md').read_text()
+    summary_prompt = _load_prompt('paper_search_agent', summary_step_name)
 
     summary_messages = [
         {
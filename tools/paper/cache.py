@@ -0,0 +1,59 @@
+"""
+Reader for the paper search agent's cache: a cache.json snapshot plus the
+append-only cache.jsonl journal of entries added since the last snapshot.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+import orjson
+
+def cache_journal_path(cache_path: Path) -> Path:
+    """Returns the append-only journal that sits next to the cache snapshot."""
+    return cache_path.with_suffix('.jsonl')
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def cache_stamp(cache_path: Path) -> Optional[Tuple]:
+    """
+    (mtime_ns, size) of the snapshot and of the journal, for readers that keep a parsed
+    copy: it changes whenever either file does. None when neither exists.
+    """
+    stamp = (_file_stamp(cache_path), _file_stamp(cache_journal_path(cache_path)))
+    return None if stamp == (None, None) else stamp
+
+def load_cache(cache_path: Path) -> dict:
+    """
+    Loads the cache snapshot if it exists and replays the journal on top of it.
+
+    Every reader must go through this: while the agent runs, its latest results
+    are only in the journal until the next snapshot.
+    """
+    try:
+        cache = orjson.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        cache = {}
+    journal_path = cache_journal_path(cache_path)
+    try:
+        f = open(journal_path, 'rb')
+    except FileNotFoundError:
+        return cache
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A torn last line from an interrupted run (or an append in progress);
+                # everything before it is intact.
+                logging.warning(f"Ignoring truncated entry at the end of {journal_path.name}.")
+                break
+            cache[entry['k']] = entry['v']
+    return cache
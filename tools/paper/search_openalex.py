@@ -5,6 +5,7 @@ Combined search strategy for maximum precision and recall.
 
 import requests
 import logging
+import threading
 from urllib.parse import quote_plus
 import time
 import json
@@ -12,6 +13,56 @@ from typing import Dict, List, Optional
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from tools.api.ratelimit import TokenBucket, bucket_from_config
+from tools.api.retry import retry_transient
+from tools.api.session import get_http_session
+from tools.config import load_config
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+# arXiv asks API clients for at most one request every three seconds.
+_ARXIV_DEFAULT_REQUESTS_PER_MINUTE = 20
+
+_arxiv_bucket = None
+_arxiv_bucket_lock = threading.Lock()
+
+def _get_arxiv_bucket() -> Optional[TokenBucket]:
+    """
+    Returns the process-wide bucket pacing arXiv API calls, shared by every thread
+    (and task) doing recall, so concurrent lookups cannot exceed arXiv's limit together.
+    """
+    global _arxiv_bucket
+    if _arxiv_bucket is None:
+        with _arxiv_bucket_lock:
+            if _arxiv_bucket is None:
+                try:
+                    config = load_config()
+                except FileNotFoundError:
+                    config = {}
+                bucket = bucket_from_config(config, 'arxiv_requests_per_minute', per=60.0,
+                                            default=_ARXIV_DEFAULT_REQUESTS_PER_MINUTE)
+                _arxiv_bucket = bucket or False  # False: pacing disabled in config
+    return _arxiv_bucket or None
+
+@retry_transient
+def _arxiv_get(params: dict) -> requests.Response:
+    """
+    Queries the arXiv API, waiting for the shared arXiv rate limit first.
+    Rate limits and transient failures are retried; every attempt takes a token.
+    """
+    bucket = _get_arxiv_bucket()
+    if bucket:
+        bucket.acquire()
+    response = get_http_session().get(ARXIV_API_URL, params=params, timeout=30)
+    response.raise_for_status()
+    return response
+
+@retry_transient
+def _openalex_get(url: str, params: Optional[dict] = None) -> requests.Response:
+    """Queries the OpenAlex API, retrying rate limits and transient failures."""
+    response = get_http_session().get(url, params=params, timeout=30)
+    response.raise_for_status()
+    return response
+
 def search_arxiv(title: str, max_results: int = 10) -> List[Dict]:
     """
     Search for papers using the arXiv API.
@@ -24,8 +75,6 @@ def search_arxiv(title: str, max_results: int = 10) -> List[Dict]:
     Returns:
         List of paper dictionaries with metadata
     """
-    base_url = "http://export.arxiv.org/api/query"
-    
     try:
         logging.info(f"Searching arXiv for: {title}")
         
@@ -39,8 +88,7 @@ def search_arxiv(title: str, max_results: int = 10) -> List[Dict]:
             'sortOrder': 'descending'
         }
         
-        response1 = requests.get(base_url, params=params1, timeout=30)
-        response1.raise_for_status()
+        response1 = _arxiv_get(params1)
         
         results = _parse_arxiv_response(response1.content)
         
@@ -68,8 +116,7 @@ def search_arxiv(title: str, max_results: int = 10) -> List[Dict]:
             'sortOrder': 'descending'
         }
         
-        response2 = requests.get(base_url, params=params2, timeout=30)
-        response2.raise_for_status()
+        response2 = _arxiv_get(params2)
         
         results = _parse_arxiv_response(response2.content)
         logging.info(f"Found {len(results)} results from arXiv (keywords)")
@@ -177,8 +224,7 @@ def search_openalex(title: str, max_results: int = 10) -> List[Dict]:
         encoded_query = title.replace(' ', '%20')
         url = f"{base_url}?search={encoded_query}&per-page={min(max_results, 25)}"
         
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        response = _openalex_get(url)
         
         data = response.json()
         works = data.get('results', [])
@@ -371,15 +417,12 @@ def _select_best_match_with_llm(original_title: str, candidates: List[Dict]) ->
     
     try:
         # Load configuration (we need a minimal config for LLM)
-        import yaml
-        config_path = project_root / "config/config.yaml"
-        if not config_path.exists():
+        try:
+            config = load_config()
+        except FileNotFoundError:
             logging.error("config.yaml not found. Cannot use LLM for result selection.")
             return None
         
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        
         # Get LLM configuration for recall step
         llm_config = _get_config_for_step(config, 'paper_search_agent', '2_recall_papers')
         
@@ -475,8 +518,7 @@ def get_paper_by_doi(doi: str) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
+        response = _openalex_get(base_url, params=params)
         
         data = response.json()
         results = data.get('results', [])
@@ -526,8 +568,7 @@ def search_openalex_by_arxiv_id(arxiv_id: str) -> Optional[Dict]:
         }
         
         try:
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
+            response = _openalex_get(base_url, params=params)
             
             data = response.json()
             results = data.get('results', [])
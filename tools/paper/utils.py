@@ -1,10 +1,31 @@
 import re
+import functools
+from pathlib import Path
 
+_PROMPTS_DIR = Path(__file__).resolve().parents[2] / 'prompts'
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+@functools.lru_cache(maxsize=4096)
 def _normalize_title(title: str) -> str:
     """Normalizes a title for comparison by lowercasing and removing non-alphanumeric chars."""
-    return re.sub(r'[^a-z0-9]', '', title.lower()) 
+    return _NON_ALNUM_RE.sub('', title.lower()) 
 
 def _get_config_for_step(config: dict, agent_name: str, step_name: str) -> dict:
     """Extracts the LLM configuration for a specific agent and step."""
     llm_name = config['agents'][agent_name][step_name]
-    return config['llms'][llm_name] 
\ No newline at end of file
+    return config['llms'][llm_name]
+
+@functools.lru_cache(maxsize=32)
+def _read_prompt_cached(path: Path, mtime_ns: int) -> str:
+    """Reads a prompt file; the mtime is part of the cache key, so edits invalidate the entry."""
+    return path.read_text(encoding='utf-8')
+
+def _load_prompt(agent_name: str, prompt_name: str) -> str:
+    """
+    Reads a prompt template from prompts/<agent_name>/<prompt_name>.md.
+
+    The file is only re-read when it changes on disk, so long-running services
+    pick up prompt edits without paying a read per call.
+    """
+    path = _PROMPTS_DIR / agent_name / f'{prompt_name}.md'
+    return _read_prompt_cached(path, path.stat().st_mtime_ns) 
\ No newline at end of file
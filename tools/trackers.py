@@ -2,6 +2,11 @@
 This module provides utility functions for tracking API usage and costs.
 """
 
+import threading
+
+# Lookups and analyses may run in worker threads that share one tracker.
+_usage_lock = threading.Lock()
+
 def update_usage(usage_tracker: dict, llm_config: dict, usage: dict):
     """
     Updates the usage tracker with token counts and calculated cost.
@@ -10,15 +15,9 @@ def update_usage(usage_tracker: dict, llm_config: dict, usage: dict):
         return
 
     model_name = llm_config['model']
-    if model_name not in usage_tracker:
-        usage_tracker[model_name] = {'input': 0, 'output': 0, 'cost_usd': 0.0}
-    
     prompt_tokens = usage.get('prompt_tokens', 0)
     completion_tokens = usage.get('completion_tokens', 0)
     
-    usage_tracker[model_name]['input'] += prompt_tokens
-    usage_tracker[model_name]['output'] += completion_tokens
-    
     # Calculate cost from config (cost per 1M tokens)
     input_cost_per_m = llm_config.get('cost', {}).get('input', 0)
     output_cost_per_m = llm_config.get('cost', {}).get('output', 0)
@@ -26,4 +25,9 @@ def update_usage(usage_tracker: dict, llm_config: dict, usage: dict):
     cost = ((prompt_tokens / 1_000_000) * input_cost_per_m) + \
            ((completion_tokens / 1_000_000) * output_cost_per_m)
     
-    usage_tracker[model_name]['cost_usd'] += cost 
\ No newline at end of file
+    with _usage_lock:
+        if model_name not in usage_tracker:
+            usage_tracker[model_name] = {'input': 0, 'output': 0, 'cost_usd': 0.0}
+        usage_tracker[model_name]['input'] += prompt_tokens
+        usage_tracker[model_name]['output'] += completion_tokens
+        usage_tracker[model_name]['cost_usd'] += cost 
\ No newline at end of file